@@ -15,8 +15,10 @@ DATA_DIR = BASE_DIR / "data"
 
 
 class AppSettings(BaseSettings):
+    # Set NEXA_ENV_READY=1 when the environment is already fully exported
+    # (containers) to skip opening and parsing the .env file.
     model_config = SettingsConfigDict(
-        env_file=".env",
+        env_file=None if os.environ.get("NEXA_ENV_READY") else os.environ.get("NEXA_ENV_FILE", ".env"),
         env_file_encoding="utf-8",
         case_sensitive=False,
         extra="ignore",
@@ -26,6 +28,15 @@ class AppSettings(BaseSettings):
     app_name: str = Field("Nexa Support", description="Service display name")
     host: str = Field("0.0.0.0", description="API bind host")
     port: int = Field(8000, description="API bind port")
+    cors_origins: list[str] = Field(
+        default_factory=lambda: [
+            "http://localhost:8080",
+            "http://127.0.0.1:8080",
+            "http://localhost:8000",
+            "http://127.0.0.1:8000",
+        ],
+        description="Origins allowed to call the API (JSON list in env)",
+    )
 
     # ── LLM provider ───────────────────────────────────
     llm_provider: str = Field("ollama", description="'ollama' or 'cloud'")
@@ -34,6 +45,9 @@ class AppSettings(BaseSettings):
     ollama_base_url: str = Field("http://localhost:11434", description="Ollama server URL")
     ollama_model: str = Field("mistral", description="Ollama model name")
     ollama_use_chat_api: bool = Field(True, description="Use /api/chat instead of /api/generate")
+    ollama_skip_validate: bool = Field(
+        False, description="Use OLLAMA_MODEL as-is instead of checking it against the server"
+    )
 
     # Cloud (OpenAI-compatible)
     cloud_api_key: str = Field("", description="API key for cloud LLM")
@@ -44,24 +58,65 @@ class AppSettings(BaseSettings):
     temperature: float = Field(0.2)
     top_p: float = Field(0.9)
     max_tokens: int = Field(512)
+    llm_concurrency: int = Field(
+        4, ge=0, description="Chat and ingest requests handled at once; others queue. 0 disables the cap"
+    )
 
     # ── Embeddings ──────────────────────────────────────
     embedding_model_name: str = Field("sentence-transformers/all-MiniLM-L6-v2")
     embedding_batch_size: int = Field(32)
+    embedding_cache_path: str = Field(
+        str(DATA_DIR / "embedding_cache" / "embeddings.sqlite3"),
+        description="SQLite cache of chunk embeddings; empty disables it",
+    )
+    embedding_cache_max_distance: int = Field(
+        3, le=3, description="Max SimHash bit distance for reusing a near-duplicate chunk's vector; -1 disables"
+    )
+    embedding_backend: str = Field("torch", description="'torch', 'onnx' or 'openvino'")
+    embedding_model_file: str | None = Field(
+        None, description="Backend model file, e.g. 'onnx/model_qint8_avx512_vnni.onnx'"
+    )
+    embedding_threads: int = Field(
+        0, ge=0, description="Intra-op threads for the embedding model; 0 uses half the cores"
+    )
+    embedding_processes: int = Field(
+        0, ge=0, description="Encoder processes for large document batches; 0 or 1 encodes in-process"
+    )
+    embedding_int8: bool = Field(
+        False, description="Export and use a dynamic int8 copy of the model (onnx backend, CPU)"
+    )
 
     # ── Vector store ────────────────────────────────────
     vector_store: str = Field("faiss", description="'faiss' or 'qdrant'")
     index_path: str = Field(str(DATA_DIR / "index.faiss"))
-    metadata_path: str = Field(str(DATA_DIR / "index_meta.json"))
+    metadata_path: str = Field(str(DATA_DIR / "index_meta.jsonl"))
+    faiss_index_type: str = Field(
+        "flat", description="'flat' (exact), 'hnsw' (approximate, sublinear) or 'sq8' (int8) for new FAISS indexes"
+    )
+    faiss_threads: int = Field(0, ge=0, description="OpenMP threads for FAISS search; 0 uses every core")
     qdrant_url: str | None = Field(None)
     qdrant_api_key: str | None = Field(None)
     qdrant_collection: str = Field("nexa_support")
+    qdrant_prefer_grpc: bool = Field(True, description="Use Qdrant's gRPC API (port below) instead of REST")
+    qdrant_grpc_port: int = Field(6334)
 
     # ── RAG ─────────────────────────────────────────────
     chunk_size: int = Field(400)
     chunk_overlap: int = Field(80)
+    ingest_processes: int = Field(
+        0, description="Worker processes for extracting/chunking files; 0 or 1 streams in-process"
+    )
     top_k: int = Field(4)
     similarity_threshold: float = Field(0.35)
+    max_context_chars: int = Field(
+        1200, ge=0, description="Clip each retrieved chunk to this many chars in the LLM prompt; 0 disables"
+    )
+    retrieval_cache_size: int = Field(
+        512, ge=0, description="Recent queries whose retrieval results are reused; 0 disables"
+    )
+    retrieval_batch_window_ms: float = Field(
+        5.0, ge=0, description="Window for batching concurrent streaming retrievals; 0 disables"
+    )
 
     # ── Prompts ─────────────────────────────────────────
     system_prompt_path: str = Field(str(APP_DIR / "config" / "prompts" / "system.txt"))
@@ -72,9 +127,15 @@ class AppSettings(BaseSettings):
     data_dir: str = Field(str(DATA_DIR))
 
     def ensure_dirs(self) -> None:
-        Path(self.data_dir).mkdir(parents=True, exist_ok=True)
-        Path(os.path.dirname(self.index_path) or ".").mkdir(parents=True, exist_ok=True)
-        Path(os.path.dirname(self.metadata_path) or ".").mkdir(parents=True, exist_ok=True)
+        """Create every data directory once, skipping duplicates."""
+        dirs = {
+            Path(self.data_dir).resolve(),
+            Path(os.path.dirname(self.index_path) or ".").resolve(),
+            Path(os.path.dirname(self.metadata_path) or ".").resolve(),
+            Path("data/uploads").resolve(),  # matches views.api.UPLOAD_DIR
+        }
+        for d in dirs:
+            d.mkdir(parents=True, exist_ok=True)
 
 
 def get_settings() -> AppSettings:
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import logging
-from typing import List, Tuple
+from typing import Any, AsyncIterator, List, Tuple
 
 from typing import TYPE_CHECKING
 
@@ -26,3 +26,37 @@ class ChatController:
         logger.info("Chat request: %s", cleaned[:80])
         answer, sources = self.pipeline.generate(cleaned)
         return answer, sources
+
+    async def ahandle_chat(self, message: str) -> Tuple[str, List[str]]:
+        """Async :meth:`handle_chat`; concurrent chats share retrieval batches."""
+        cleaned = message.strip()
+        if not cleaned:
+            raise ValueError("Message cannot be empty")
+
+        logger.info("Chat request: %s", cleaned[:80])
+        return await self.pipeline.agenerate(cleaned)
+
+    def handle_chat_batch(self, messages: List[str]) -> List[Tuple[str, List[str]]]:
+        """Validate every message and return ``(answer, sources)`` per message."""
+        cleaned = [m.strip() for m in messages]
+        if not cleaned:
+            raise ValueError("Messages list is empty")
+        if not all(cleaned):
+            raise ValueError("Message cannot be empty")
+
+        logger.info("Chat batch request: %d messages", len(cleaned))
+        return self.pipeline.generate_batch(cleaned)
+
+    async def handle_chat_stream(self, message: str) -> AsyncIterator[Tuple[str, Any]]:
+        """Validate the message and yield ``(kind, payload)`` stream events.
+
+        Uses the pipeline's async stream, so the event loop keeps serving
+        other requests while tokens arrive.
+        """
+        cleaned = message.strip()
+        if not cleaned:
+            raise ValueError("Message cannot be empty")
+
+        logger.info("Chat stream request: %s", cleaned[:80])
+        async for event in self.pipeline.agenerate_stream(cleaned):
+            yield event
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-
-from typing import TYPE_CHECKING
+import time
+from typing import TYPE_CHECKING, Optional, Tuple
+from weakref import WeakKeyDictionary
 
 from app.models.schemas import HealthResponse
 
@@ -13,14 +15,40 @@ if TYPE_CHECKING:  # pragma: no cover
 
 logger = logging.getLogger(__name__)
 
+# Last result per LLM client, shared across controller instances so frequent
+# probes reuse one round-trip.  Entries vanish when a client is replaced.
+_results: "WeakKeyDictionary[LLMClient, Tuple[float, HealthResponse]]" = WeakKeyDictionary()
+
 
 class HealthController:
-    def __init__(self, llm: LLMClient) -> None:
+    def __init__(self, llm: LLMClient, ttl: float = 2.0) -> None:
         self.llm = llm
+        self.ttl = ttl
 
     def check_health(self) -> HealthResponse:
+        """Return the LLM health, reusing a result younger than ``ttl`` seconds."""
+        cached = self._fresh_result()
+        if cached is not None:
+            return cached
+
+        now = time.monotonic()
         llm_ok = self.llm.health_check()
         status = "ok" if llm_ok else "degraded"
         detail = "All systems operational" if llm_ok else "LLM service unreachable"
         logger.info("Health check: status=%s llm=%s", status, llm_ok)
-        return HealthResponse(status=status, llm_connected=llm_ok, detail=detail)
+        result = HealthResponse(status=status, llm_connected=llm_ok, detail=detail)
+        _results[self.llm] = (now, result)
+        return result
+
+    async def acheck_health(self) -> HealthResponse:
+        """Async :meth:`check_health`; only an actual probe runs in a thread."""
+        cached = self._fresh_result()
+        if cached is not None:
+            return cached
+        return await asyncio.to_thread(self.check_health)
+
+    def _fresh_result(self) -> Optional[HealthResponse]:
+        cached = _results.get(self.llm)
+        if cached is not None and time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+        return None
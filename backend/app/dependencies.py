@@ -2,15 +2,73 @@
 
 from __future__ import annotations
 
+import atexit
+import importlib.util
 import logging
-from functools import lru_cache
-from typing import Any, Dict
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+from typing import Any
+
+import httpx
 
 from app.config.settings import AppSettings
 
 logger = logging.getLogger(__name__)
 
-_cache: Dict[str, Any] = {}
+
+def _singleton(factory):
+    """``lru_cache`` a zero-arg factory and serialise its construction.
+
+    Without the lock, the startup warm-up and a concurrent first request
+    could each load the embedding model, or end up holding different
+    vector-store instances.  Each factory has its own lock so independent
+    services can be built in parallel; nested builds always lock in the
+    same order (pipeline → store → embedder), so they cannot deadlock.
+    """
+    cached = lru_cache(maxsize=1)(factory)
+    lock = threading.Lock()
+
+    @wraps(factory)
+    def wrapper():
+        with lock:
+            return cached()
+
+    wrapper.cache_clear = cached.cache_clear
+    wrapper.cache_info = cached.cache_info
+    return wrapper
+
+
+def warm_up() -> None:
+    """Build the services ahead of the first request.
+
+    The embedder/vector store and the LLM client are independent and
+    mostly I/O or import bound, so they are built concurrently before the
+    pipeline that ties them together.  The LLM client's model is resolved
+    here too, since an Ollama client checks it against the server lazily.
+    """
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="warm-up") as pool:
+        futures = [
+            pool.submit(get_vector_store),
+            pool.submit(lambda: getattr(get_llm_client(), "model", None)),
+        ]
+    try:
+        for future in futures:
+            future.result()
+        get_rag_pipeline()
+    except Exception:
+        logger.warning("Service warm-up failed; will retry on first use", exc_info=True)
+
+
+# Bumped whenever the shared settings change, so views derived from them
+# can tell when a cached copy is stale.
+_settings_revision = 0
+
+
+def settings_revision() -> int:
+    """Return a counter that changes whenever the shared settings change."""
+    return _settings_revision
 
 
 @lru_cache(maxsize=1)
@@ -20,108 +78,217 @@ def get_settings() -> AppSettings:
     return settings
 
 
+def update_settings(**changes: Any) -> AppSettings:
+    """Apply runtime changes to the shared settings instance.
+
+    All runtime mutation goes through here so cached views of the settings
+    have a single place to be invalidated.
+    """
+    settings = get_settings()
+    unknown = set(changes) - set(AppSettings.model_fields)
+    if unknown:
+        raise ValueError(f"Unknown settings: {sorted(unknown)}")
+    global _settings_revision
+    for key, value in changes.items():
+        setattr(settings, key, value)
+    _settings_revision += 1
+    return settings
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    """Return the process-wide pooled HTTP client shared by the LLM clients.
+
+    It survives LLM client rebuilds (model/provider/profile switches), so
+    keep-alive connections are reused instead of re-opened.  HTTP/2 is used
+    for HTTPS endpoints when ``h2`` is installed, letting concurrent cloud
+    calls share one TLS connection; plain-HTTP Ollama stays on HTTP/1.1.
+    """
+    client = httpx.Client(
+        http2=importlib.util.find_spec("h2") is not None,
+        timeout=httpx.Timeout(120.0, connect=5.0),
+        limits=httpx.Limits(
+            max_keepalive_connections=32, max_connections=64, keepalive_expiry=300.0
+        ),
+    )
+    atexit.register(client.close)
+    return client
+
+
+@lru_cache(maxsize=1)
+def get_async_http_client() -> httpx.AsyncClient:
+    """Return the pooled async HTTP client shared by the LLM clients.
+
+    The ``agenerate*`` methods of every LLM client built by
+    :func:`get_llm_client` run on it, so a rebuild does not leave a
+    connection pool behind.  The app lifespan closes it on shutdown.
+    """
+    return httpx.AsyncClient(
+        http2=importlib.util.find_spec("h2") is not None,
+        timeout=httpx.Timeout(120.0, connect=5.0),
+        limits=httpx.Limits(
+            max_keepalive_connections=32, max_connections=64, keepalive_expiry=300.0
+        ),
+    )
+
+
+@_singleton
 def get_llm_client():
     """Return the configured LLM client (Ollama or Cloud)."""
-    if "llm" not in _cache:
-        settings = get_settings()
-        if settings.llm_provider == "ollama":
-            from app.services.llm.ollama_client import OllamaClient
-
-            _cache["llm"] = OllamaClient(
-                base_url=settings.ollama_base_url,
-                model=settings.ollama_model,
-                temperature=settings.temperature,
-                top_p=settings.top_p,
-                max_tokens=settings.max_tokens,
-                use_chat_api=settings.ollama_use_chat_api,
-            )
-        elif settings.llm_provider == "cloud":
-            from app.services.llm.cloud_client import CloudLLMClient
-
-            _cache["llm"] = CloudLLMClient(
-                api_key=settings.cloud_api_key,
-                base_url=settings.cloud_base_url,
-                model=settings.cloud_model,
-                temperature=settings.temperature,
-                top_p=settings.top_p,
-                max_tokens=settings.max_tokens,
-            )
-        else:
-            raise ValueError(f"Unknown LLM provider: {settings.llm_provider}")
-        logger.info("LLM client created: provider=%s", settings.llm_provider)
-    return _cache["llm"]
+    settings = get_settings()
+    if settings.llm_provider == "ollama":
+        from app.services.llm.ollama_client import OllamaClient
 
+        client = OllamaClient(
+            base_url=settings.ollama_base_url,
+            model=settings.ollama_model,
+            temperature=settings.temperature,
+            top_p=settings.top_p,
+            max_tokens=settings.max_tokens,
+            use_chat_api=settings.ollama_use_chat_api,
+            validate_model=not settings.ollama_skip_validate,
+            http_client=get_http_client(),
+            async_http_client=get_async_http_client(),
+        )
+    elif settings.llm_provider == "cloud":
+        from app.services.llm.cloud_client import CloudLLMClient
+
+        client = CloudLLMClient(
+            api_key=settings.cloud_api_key,
+            base_url=settings.cloud_base_url,
+            model=settings.cloud_model,
+            temperature=settings.temperature,
+            top_p=settings.top_p,
+            max_tokens=settings.max_tokens,
+            http_client=get_http_client(),
+            async_http_client=get_async_http_client(),
+        )
+    else:
+        raise ValueError(f"Unknown LLM provider: {settings.llm_provider}")
+    logger.info("LLM client created: provider=%s", settings.llm_provider)
+    return client
 
+
+@_singleton
 def get_embedder():
     """Return the embedding service (sentence-transformers)."""
-    if "embedder" not in _cache:
-        settings = get_settings()
-        from app.services.rag.embeddings import EmbeddingService
+    settings = get_settings()
+    from app.services.rag.embeddings import EmbeddingService
 
-        _cache["embedder"] = EmbeddingService(
-            model_name=settings.embedding_model_name,
-            batch_size=settings.embedding_batch_size,
-        )
-        logger.info("Embedding service created: model=%s", settings.embedding_model_name)
-    return _cache["embedder"]
+    embedder = EmbeddingService(
+        model_name=settings.embedding_model_name,
+        batch_size=settings.embedding_batch_size,
+        backend=settings.embedding_backend,
+        model_file=settings.embedding_model_file,
+        int8_dir=(
+            os.path.join(settings.data_dir, "embedding_models") if settings.embedding_int8 else None
+        ),
+        threads=settings.embedding_threads,
+        processes=settings.embedding_processes,
+    )
+    atexit.register(embedder.close)
+    logger.info("Embedding service created: model=%s", settings.embedding_model_name)
+    return embedder
 
 
+@_singleton
 def get_vector_store():
     """Return the vector store (FAISS or Qdrant)."""
-    if "store" not in _cache:
-        settings = get_settings()
-        embedder = get_embedder()
-        from app.services.rag.vector_store import create_vector_store
-
-        _cache["store"] = create_vector_store(
-            kind=settings.vector_store,
-            dim=embedder.dimension,
-            index_path=settings.index_path,
-            metadata_path=settings.metadata_path,
-            qdrant_url=settings.qdrant_url,
-            qdrant_api_key=settings.qdrant_api_key,
-            qdrant_collection=settings.qdrant_collection,
-        )
-        logger.info("Vector store created: kind=%s", settings.vector_store)
-    return _cache["store"]
+    settings = get_settings()
+    embedder = get_embedder()
+    from app.services.rag.vector_store import create_vector_store
+
+    store = create_vector_store(
+        kind=settings.vector_store,
+        dim=embedder.dimension,
+        index_path=settings.index_path,
+        metadata_path=settings.metadata_path,
+        qdrant_url=settings.qdrant_url,
+        qdrant_api_key=settings.qdrant_api_key,
+        qdrant_collection=settings.qdrant_collection,
+        qdrant_prefer_grpc=settings.qdrant_prefer_grpc,
+        qdrant_grpc_port=settings.qdrant_grpc_port,
+        faiss_index_type=settings.faiss_index_type,
+        faiss_threads=settings.faiss_threads,
+    )
+    logger.info("Vector store created: kind=%s", settings.vector_store)
+    return store
 
 
+@_singleton
 def get_rag_pipeline():
     """Return the RAG pipeline (embedder + store + LLM)."""
-    if "pipeline" not in _cache:
-        settings = get_settings()
-        from app.services.rag.pipeline import RAGPipeline
-
-        _cache["pipeline"] = RAGPipeline(
-            embedder=get_embedder(),
-            store=get_vector_store(),
-            llm=get_llm_client(),
-            system_prompt_path=settings.system_prompt_path,
-            rag_prompt_path=settings.rag_prompt_path,
-            top_k=settings.top_k,
-            similarity_threshold=settings.similarity_threshold,
-        )
-        logger.info("RAG pipeline created")
-    return _cache["pipeline"]
+    settings = get_settings()
+    from app.services.rag.pipeline import RAGPipeline
 
+    pipeline = RAGPipeline(
+        embedder=get_embedder(),
+        store=get_vector_store(),
+        llm=get_llm_client(),
+        system_prompt_path=settings.system_prompt_path,
+        rag_prompt_path=settings.rag_prompt_path,
+        top_k=settings.top_k,
+        similarity_threshold=settings.similarity_threshold,
+        batch_window=settings.retrieval_batch_window_ms / 1000,
+        max_context_chars=settings.max_context_chars,
+        retrieval_cache_size=settings.retrieval_cache_size,
+    )
+    logger.info("RAG pipeline created")
+    return pipeline
 
+
+@_singleton
 def get_ingestion_service():
     """Return the ingestion service."""
-    if "ingestion" not in _cache:
-        settings = get_settings()
-        from app.services.ingestion.ingest_service import IngestionService
-
-        _cache["ingestion"] = IngestionService(
-            embedder=get_embedder(),
-            store=get_vector_store(),
-            chunk_size=settings.chunk_size,
-            chunk_overlap=settings.chunk_overlap,
+    settings = get_settings()
+    from app.services.ingestion.ingest_service import IngestionService
+    from app.services.rag.embedding_cache import EmbeddingCache
+
+    cache = (
+        EmbeddingCache(
+            settings.embedding_cache_path,
+            get_embedder().variant,
+            max_distance=settings.embedding_cache_max_distance,
         )
-        logger.info("Ingestion service created")
-    return _cache["ingestion"]
+        if settings.embedding_cache_path
+        else None
+    )
+    service = IngestionService(
+        embedder=get_embedder(),
+        store=get_vector_store(),
+        chunk_size=settings.chunk_size,
+        chunk_overlap=settings.chunk_overlap,
+        batch_size=settings.embedding_batch_size,
+        cache=cache,
+        processes=settings.ingest_processes,
+    )
+    logger.info("Ingestion service created")
+    return service
+
+
+def reset_llm() -> None:
+    """Drop the LLM client and everything built on top of it."""
+    get_llm_client.cache_clear()
+    get_rag_pipeline.cache_clear()
+
+
+def reset_store() -> None:
+    """Drop the vector store and everything built on top of it."""
+    get_vector_store.cache_clear()
+    get_rag_pipeline.cache_clear()
+    get_ingestion_service.cache_clear()
 
 
 def reset_cache() -> None:
     """Clear all cached singletons. Used by tests."""
-    _cache.clear()
-    get_settings.cache_clear()
+    global _settings_revision
+    _settings_revision += 1
+    for factory in (
+        get_llm_client,
+        get_embedder,
+        get_vector_store,
+        get_rag_pipeline,
+        get_ingestion_service,
+        get_settings,
+    ):
+        factory.cache_clear()
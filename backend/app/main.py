@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -11,6 +13,36 @@ from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from app.config.settings import get_settings
+from app.views.orjson_response import ORJSONResponse
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """Static files whose names carry a content hash, cached for a year."""
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["cache-control"] = "public, max-age=31536000, immutable"
+        return response
+
+
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    """Warm up heavy services in the background once the server is up.
+
+    Nothing model-related is imported at module load, so the worker starts
+    serving ``/api/health`` and static files immediately while the
+    embedding model and vector index load off the event loop.  On shutdown
+    the shared async HTTP client's connections are closed.
+    """
+    from app.dependencies import get_async_http_client, warm_up
+
+    task = asyncio.create_task(asyncio.to_thread(warm_up))
+    yield
+    if not task.done():
+        task.cancel()
+    if get_async_http_client.cache_info().currsize:
+        await get_async_http_client().aclose()
+        get_async_http_client.cache_clear()
 
 
 def create_app() -> FastAPI:
@@ -25,14 +57,16 @@ def create_app() -> FastAPI:
         title=settings.app_name,
         version="2.0.0",
         description="Nexa Support — RAG-powered support chatbot with Ollama and cloud LLM support",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     application.add_middleware(
         CORSMiddleware,
-        allow_origins=["*"],
+        allow_origins=settings.cors_origins,
         allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
+        allow_methods=["GET", "POST", "PUT", "DELETE"],
+        allow_headers=["content-type", "authorization"],
     )
     application.add_middleware(GZipMiddleware, minimum_size=500)
 
@@ -40,9 +74,6 @@ def create_app() -> FastAPI:
 
     application.include_router(router)
 
-    # Ensure upload directory exists
-    Path("data/uploads").mkdir(parents=True, exist_ok=True)
-
     # Serve static frontend (production)
     static_dir = Path(__file__).resolve().parent.parent / "static"
     if static_dir.is_dir():
@@ -57,7 +88,7 @@ def create_app() -> FastAPI:
 
         application.mount(
             "/assets",
-            StaticFiles(directory=str(static_dir / "assets")),
+            ImmutableStaticFiles(directory=str(static_dir / "assets"), check_dir=False),
             name="static-assets",
         )
 
@@ -4,7 +4,13 @@ from __future__ import annotations
 
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class FrozenModel(BaseModel):
+    """Immutable base for value entries that are built in large lists."""
+
+    model_config = ConfigDict(frozen=True)
 
 
 # ── Requests ────────────────────────────────────────────
@@ -15,6 +21,12 @@ class ChatRequest(BaseModel):
     session_id: Optional[str] = Field(None, description="Optional session identifier")
 
 
+class ChatBatchRequest(BaseModel):
+    messages: List[ChatRequest] = Field(
+        ..., min_length=1, max_length=32, description="Questions answered together"
+    )
+
+
 class IngestRequest(BaseModel):
     paths: List[str] = Field(..., min_length=1, description="Files or directories to ingest")
     tags: Optional[List[str]] = Field(default=None, description="Optional metadata tags")
@@ -29,6 +41,10 @@ class ChatResponse(BaseModel):
     sources: List[str]
 
 
+class ChatBatchResponse(BaseModel):
+    results: List[ChatResponse]
+
+
 class HealthResponse(BaseModel):
     status: str
     llm_connected: bool
@@ -46,7 +62,7 @@ class ConfigResponse(BaseModel):
     embedding_model: str
 
 
-class OllamaModelEntry(BaseModel):
+class OllamaModelEntry(FrozenModel):
     name: str
     size: Optional[int] = None
     digest: Optional[str] = None
@@ -91,7 +107,7 @@ class UploadResponse(BaseModel):
 # ── Domain ──────────────────────────────────────────────
 
 
-class DocumentChunk(BaseModel):
+class DocumentChunk(FrozenModel):
     id: str
     text: str
     metadata: dict
@@ -100,7 +116,7 @@ class DocumentChunk(BaseModel):
 # ── Chat History ────────────────────────────────────────
 
 
-class HistoryMessage(BaseModel):
+class HistoryMessage(FrozenModel):
     role: str  # "user" or "assistant"
     text: str
     sources: List[str] = []
@@ -113,7 +129,7 @@ class SessionCreate(BaseModel):
     documents: List[str] = []
 
 
-class SessionSummary(BaseModel):
+class SessionSummary(FrozenModel):
     id: str
     title: str
     message_count: int = 0
@@ -151,7 +167,7 @@ class PromptsUpdateRequest(BaseModel):
 # ── Uploaded files ──────────────────────────────────────
 
 
-class UploadedFileEntry(BaseModel):
+class UploadedFileEntry(FrozenModel):
     name: str
     path: str
     size: int
@@ -217,7 +233,7 @@ class ApiKeysUpdateRequest(BaseModel):
 # ── Cloud Model Listing ─────────────────────────────────
 
 
-class CloudModelEntry(BaseModel):
+class CloudModelEntry(FrozenModel):
     id: str
     owned_by: str = ""
 
@@ -1,15 +1,34 @@
 """Chat session history — JSON file-based persistence.
 
-Stores sessions under ``data/history/`` as individual JSON files.
+Stores sessions under ``data/history/`` as two files per session:
+
+* ``<id>.meta.json`` — title, timestamps, counts and document paths
+* ``<id>.messages.jsonl.zst`` — one message per line, zstd-compressed;
+  each save that extends the chat appends one more zstd frame.  A save
+  that rewrites the log writes it as ``<id>.messages.jsonl.zst.<n>``
+  instead, the next generation, and the metadata names the current one.
+
+Listing sessions only reads the small metadata files.  The metadata is
+written last, through a temp file and ``os.replace``; it records which log
+is current and how many of its bytes are committed, and a rewritten log's
+predecessor is removed only after that.  A crash mid-save therefore never
+leaves a half-written session.  Sessions written by older versions as a
+single ``<id>.json`` or an uncompressed ``<id>.messages.jsonl`` are still
+read, and are converted the next time they are saved.
 """
 
 from __future__ import annotations
 
-import json
+import hashlib
 import logging
+import os
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+import zstandard
 
 from app.models.schemas import (
     HistoryMessage,
@@ -22,6 +41,24 @@ logger = logging.getLogger(__name__)
 
 HISTORY_DIR = Path("data/history")
 
+_META_SUFFIX = ".meta.json"
+_MESSAGES_SUFFIX = ".messages.jsonl.zst"
+_PLAIN_MESSAGES_SUFFIX = ".messages.jsonl"
+_ZSTD_LEVEL = 3
+_LISTING_SETTLE_NS = 1_000_000_000
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f"{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _is_log_generation(name: str) -> bool:
+    """True for ``<id>.messages.jsonl.zst.<n>``, a rewritten message log."""
+    stem, _, generation = name.rpartition(".")
+    return generation.isdigit() and stem.endswith(_MESSAGES_SUFFIX)
+
 
 class HistoryService:
     """CRUD operations for chat session history (JSON files)."""
@@ -29,48 +66,146 @@ class HistoryService:
     def __init__(self, base_dir: Path | None = None):
         self.base_dir = base_dir or HISTORY_DIR
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        # file name -> (mtime_ns, size, summary)
+        self._summary_cache: Dict[str, Tuple[int, int, SessionSummary]] = {}
+        # (directory mtime_ns, sorted summaries) from the last full listing
+        self._listing: Optional[Tuple[int, List[SessionSummary]]] = None
+
+    def _safe_id(self, session_id: str) -> str:
+        return session_id.replace("/", "_").replace("\\", "_")
+
+    def _meta_path(self, session_id: str) -> Path:
+        return self.base_dir / f"{self._safe_id(session_id)}{_META_SUFFIX}"
 
-    def _session_path(self, session_id: str) -> Path:
-        safe_id = session_id.replace("/", "_").replace("\\", "_")
-        return self.base_dir / f"{safe_id}.json"
+    def _messages_path(self, session_id: str, generation: int = 0) -> Path:
+        name = f"{self._safe_id(session_id)}{_MESSAGES_SUFFIX}"
+        return self.base_dir / (f"{name}.{generation}" if generation else name)
+
+    def _plain_messages_path(self, session_id: str) -> Path:
+        return self.base_dir / f"{self._safe_id(session_id)}{_PLAIN_MESSAGES_SUFFIX}"
+
+    def _legacy_path(self, session_id: str) -> Path:
+        return self.base_dir / f"{self._safe_id(session_id)}.json"
 
     def _now_iso(self) -> str:
         return datetime.now(timezone.utc).isoformat()
 
+    # ── Raw storage ─────────────────────────────────────
+
+    def _read_meta(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return the session's metadata dict, from either storage layout."""
+        meta_path = self._meta_path(session_id)
+        if meta_path.exists():
+            return orjson.loads(meta_path.read_bytes())
+        legacy = self._legacy_path(session_id)
+        if legacy.exists():
+            data = orjson.loads(legacy.read_bytes())
+            data["message_count"] = len(data.get("messages", []))
+            return data
+        return None
+
+    def _read_messages(
+        self, session_id: str, committed: Optional[int] = None, generation: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Read the message log; *committed* bytes bound it when known."""
+        messages_path = self._messages_path(session_id, generation)
+        if messages_path.exists():
+            with open(messages_path, "rb") as fh:
+                compressed = fh.read(committed) if committed is not None else fh.read()
+            reader = zstandard.ZstdDecompressor().stream_reader(compressed, read_across_frames=True)
+            return [orjson.loads(line) for line in reader.read().splitlines() if line]
+        plain = self._plain_messages_path(session_id)
+        if plain.exists():
+            return [orjson.loads(line) for line in plain.read_bytes().splitlines() if line]
+        legacy = self._legacy_path(session_id)
+        if legacy.exists():
+            return orjson.loads(legacy.read_bytes()).get("messages", [])
+        return []
+
+    def _summary_from_meta(self, data: Dict[str, Any], fallback_id: str) -> SessionSummary:
+        return SessionSummary(
+            id=data.get("id", fallback_id),
+            title=data.get("title", "Untitled"),
+            message_count=data.get("message_count", 0),
+            document_count=len(data.get("documents", [])),
+            created_at=data.get("created_at", ""),
+            updated_at=data.get("updated_at", ""),
+        )
+
     # ── List ────────────────────────────────────────────
 
     def list_sessions(self) -> List[SessionSummary]:
-        """Return summaries of all saved sessions, newest first."""
-        summaries: list[SessionSummary] = []
-        for p in sorted(self.base_dir.glob("*.json"), key=lambda f: f.stat().st_mtime, reverse=True):
+        """Return summaries of all saved sessions, newest first.
+
+        Every save or delete replaces or removes a file in the history
+        directory, so while the directory's mtime is unchanged the previous
+        listing is returned after a single ``stat`` — whichever worker
+        process made the change.  Otherwise parsed summaries are cached per
+        file and reused while the file's ``(mtime_ns, size)`` is unchanged.
+        """
+        dir_mtime = self.base_dir.stat().st_mtime_ns
+        if self._listing is not None and self._listing[0] == dir_mtime:
+            return list(self._listing[1])
+
+        with os.scandir(self.base_dir) as it:
+            entries = {e.name: e for e in it if e.name.endswith(".json") and e.is_file()}
+
+        listed: list[tuple[int, SessionSummary]] = []
+        for name, entry in entries.items():
+            if name.endswith(_META_SUFFIX):
+                fallback_id = name[: -len(_META_SUFFIX)]
+            elif f"{name[:-5]}{_META_SUFFIX}" in entries:
+                continue  # stale legacy copy; the new layout wins
+            else:
+                fallback_id = name[:-5]
+
+            st = entry.stat()
+            cached = self._summary_cache.get(name)
+            if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+                listed.append((st.st_mtime_ns, cached[2]))
+                continue
             try:
-                data = json.loads(p.read_text(encoding="utf-8"))
-                summaries.append(
-                    SessionSummary(
-                        id=data.get("id", p.stem),
-                        title=data.get("title", "Untitled"),
-                        message_count=len(data.get("messages", [])),
-                        document_count=len(data.get("documents", [])),
-                        created_at=data.get("created_at", ""),
-                        updated_at=data.get("updated_at", ""),
-                    )
-                )
+                data = orjson.loads(Path(entry.path).read_bytes())
+                if not name.endswith(_META_SUFFIX):
+                    data["message_count"] = len(data.get("messages", []))
+                summary = self._summary_from_meta(data, fallback_id)
             except Exception as exc:
-                logger.warning("Skipping corrupt session file %s: %s", p, exc)
-        return summaries
+                logger.warning("Skipping corrupt session file %s: %s", entry.path, exc)
+                continue
+            self._summary_cache[name] = (st.st_mtime_ns, st.st_size, summary)
+            listed.append((st.st_mtime_ns, summary))
+
+        # Listings can run concurrently on the threadpool: prune from a
+        # snapshot of the keys and tolerate entries another call removed.
+        for name in list(self._summary_cache):
+            if name not in entries:
+                self._summary_cache.pop(name, None)
+
+        listed.sort(key=lambda item: item[0], reverse=True)
+        summaries = [summary for _, summary in listed]
+        # A change landing in the same timestamp tick as the scan would not
+        # move the mtime, so only trust listings of a directory that has
+        # been quiet for a moment.
+        if time.time_ns() - dir_mtime > _LISTING_SETTLE_NS:
+            self._listing = (dir_mtime, summaries)
+        return list(summaries)
 
     # ── Get ─────────────────────────────────────────────
 
     def get_session(self, session_id: str) -> Optional[SessionDetail]:
-        p = self._session_path(session_id)
-        if not p.exists():
-            return None
         try:
-            data = json.loads(p.read_text(encoding="utf-8"))
+            data = self._read_meta(session_id)
+            if data is None:
+                return None
             return SessionDetail(
                 id=data["id"],
                 title=data.get("title", "Untitled"),
-                messages=[HistoryMessage(**m) for m in data.get("messages", [])],
+                messages=[
+                    HistoryMessage(**m)
+                    for m in self._read_messages(
+                        session_id, data.get("messages_bytes"), data.get("messages_generation", 0)
+                    )
+                ],
                 documents=data.get("documents", []),
                 created_at=data.get("created_at", ""),
                 updated_at=data.get("updated_at", ""),
@@ -82,28 +217,78 @@ class HistoryService:
     # ── Save / Update ───────────────────────────────────
 
     def save_session(self, session: SessionCreate) -> SessionDetail:
-        """Create or update a session."""
-        p = self._session_path(session.id)
+        """Create or update a session.
+
+        When the incoming messages extend what is already stored (checked
+        against a digest of the stored log kept in the metadata), only the
+        new ones are appended; otherwise the message log is rewritten as
+        the next generation, so the old log and metadata stay consistent
+        until the new metadata replaces them.
+        """
         now = self._now_iso()
 
-        if p.exists():
-            try:
-                existing = json.loads(p.read_text(encoding="utf-8"))
-                created_at = existing.get("created_at", now)
-            except Exception:
-                created_at = now
+        try:
+            existing = self._read_meta(session.id)
+        except Exception:
+            existing = None
+        created_at = (existing or {}).get("created_at", now)
+        stored_count = (existing or {}).get("message_count", 0)
+
+        lines = [
+            orjson.dumps(m.model_dump(), option=orjson.OPT_APPEND_NEWLINE)
+            for m in session.messages
+        ]
+        digest = hashlib.sha1()
+        prefix_digest = None
+        for i, line in enumerate(lines):
+            if i == stored_count:
+                prefix_digest = digest.hexdigest()
+            digest.update(line)
+        if stored_count == len(lines):
+            prefix_digest = digest.hexdigest()
+
+        generation = (existing or {}).get("messages_generation", 0)
+        messages_path = self._messages_path(session.id, generation)
+        committed = (existing or {}).get("messages_bytes")
+        appendable = (
+            stored_count > 0
+            and prefix_digest is not None
+            and prefix_digest == (existing or {}).get("messages_digest")
+            and committed is not None
+            and messages_path.exists()
+        )
+        compressor = zstandard.ZstdCompressor(level=_ZSTD_LEVEL)
+        if appendable:
+            # Drop any frame left by an interrupted save before appending.
+            with open(messages_path, "r+b") as fh:
+                fh.truncate(committed)
+                fh.seek(committed)
+                if len(lines) > stored_count:
+                    fh.write(compressor.compress(b"".join(lines[stored_count:])))
+                messages_bytes = fh.tell()
         else:
-            created_at = now
+            if existing is not None:
+                generation += 1
+            frame = compressor.compress(b"".join(lines))
+            _write_atomic(self._messages_path(session.id, generation), frame)
+            messages_bytes = len(frame)
 
-        payload = {
+        meta = {
             "id": session.id,
             "title": session.title,
-            "messages": [m.model_dump() for m in session.messages],
             "documents": session.documents,
+            "message_count": len(lines),
+            "messages_digest": digest.hexdigest(),
+            "messages_bytes": messages_bytes,
+            "messages_generation": generation,
             "created_at": created_at,
             "updated_at": now,
         }
-        p.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+        _write_atomic(self._meta_path(session.id), orjson.dumps(meta, option=orjson.OPT_INDENT_2))
+        if not appendable and existing is not None:
+            messages_path.unlink(missing_ok=True)  # the generation just replaced
+        self._plain_messages_path(session.id).unlink(missing_ok=True)
+        self._legacy_path(session.id).unlink(missing_ok=True)
         logger.info("Saved session %s (%d messages)", session.id, len(session.messages))
 
         return SessionDetail(
@@ -118,22 +303,61 @@ class HistoryService:
     # ── Delete ──────────────────────────────────────────
 
     def delete_session(self, session_id: str) -> bool:
-        p = self._session_path(session_id)
-        if not p.exists():
+        try:
+            data = self._read_meta(session_id) or {}
+        except Exception:
+            data = {}
+        paths = [
+            self._meta_path(session_id),
+            self._messages_path(session_id),
+            self._messages_path(session_id, data.get("messages_generation", 0)),
+            self._plain_messages_path(session_id),
+            self._legacy_path(session_id),
+        ]
+        if not any(p.exists() for p in paths):
             return False
 
         # Clean up uploaded documents associated with this session
         try:
-            data = json.loads(p.read_text(encoding="utf-8"))
-            documents = data.get("documents", [])
-            for doc_path in documents:
-                doc_file = Path(doc_path)
-                if doc_file.exists() and doc_file.is_file():
-                    doc_file.unlink()
-                    logger.info("Deleted associated document: %s", doc_path)
+            self._delete_documents(data)
         except Exception as exc:
             logger.warning("Error cleaning up documents for session %s: %s", session_id, exc)
 
-        p.unlink()
+        for p in paths:
+            p.unlink(missing_ok=True)
         logger.info("Deleted session %s", session_id)
         return True
+
+    def delete_all(self) -> int:
+        """Delete every session in one directory pass; return how many."""
+        with os.scandir(self.base_dir) as it:
+            files = {e.name: Path(e.path) for e in it if e.is_file()}
+
+        count = 0
+        for name, path in files.items():
+            if name.endswith(_META_SUFFIX) or (
+                name.endswith(".json") and f"{name[:-5]}{_META_SUFFIX}" not in files
+            ):
+                try:
+                    self._delete_documents(orjson.loads(path.read_bytes()))
+                except Exception as exc:
+                    logger.warning("Error cleaning up documents for %s: %s", path, exc)
+                count += 1
+            elif not (
+                name.endswith((".json", _MESSAGES_SUFFIX, _PLAIN_MESSAGES_SUFFIX))
+                or _is_log_generation(name)
+            ):
+                continue
+            path.unlink(missing_ok=True)
+
+        self._summary_cache.clear()
+        self._listing = None
+        logger.info("Deleted %d sessions", count)
+        return count
+
+    def _delete_documents(self, data: Dict[str, Any]) -> None:
+        for doc_path in data.get("documents", []):
+            doc_file = Path(doc_path)
+            if doc_file.exists() and doc_file.is_file():
+                doc_file.unlink()
+                logger.info("Deleted associated document: %s", doc_path)
@@ -2,21 +2,61 @@
 
 from __future__ import annotations
 
-from typing import List
+import re
+from typing import Iterable, Iterator, List, Tuple
+
+_WORD = re.compile(r"\S+")
 
 
 def chunk_text(text: str, chunk_size: int = 400, chunk_overlap: int = 80) -> List[str]:
-    """Split *text* into overlapping chunks of approximately *chunk_size* words."""
-    words = text.split()
-    if not words:
-        return []
-
-    chunks: List[str] = []
-    start = 0
-    while start < len(words):
-        end = start + chunk_size
-        chunks.append(" ".join(words[start:end]))
-        if end >= len(words):
-            break
-        start = max(0, end - chunk_overlap)
-    return chunks
+    """Split *text* into overlapping chunks of approximately *chunk_size* words.
+
+    Each chunk is a single slice of *text* from its first word's start to
+    its last word's end, so the original spacing inside a chunk is kept.
+    """
+    return list(chunk_stream([text], chunk_size, chunk_overlap))
+
+
+def chunk_stream(
+    segments: Iterable[str], chunk_size: int = 400, chunk_overlap: int = 80
+) -> Iterator[str]:
+    """Chunk text arriving as *segments* (pages, blocks) without joining it.
+
+    Produces the same chunks as ``chunk_text("".join(segments))`` but only
+    holds the current window plus one segment in memory.  A word cut by a
+    segment boundary is carried over until the next segment completes it.
+    """
+    step = max(1, chunk_size - chunk_overlap)
+    buf = ""
+    spans: List[Tuple[int, int]] = []  # word offsets in buf, oldest first
+    scan_from = 0
+    fresh = 0  # words not yet part of an emitted chunk
+
+    def scan(final: bool) -> Iterator[str]:
+        nonlocal scan_from, spans, fresh
+        for match in _WORD.finditer(buf, scan_from):
+            if match.end() == len(buf) and not final:
+                return  # may continue in the next segment
+            spans.append(match.span())
+            scan_from = match.end()
+            fresh += 1
+            if len(spans) >= chunk_size:
+                yield buf[spans[0][0]:spans[chunk_size - 1][1]]
+                spans = spans[step:]
+                fresh = 0
+
+    for segment in segments:
+        if not segment:
+            continue
+        # Drop text before the oldest word still needed, once per segment.
+        cut = spans[0][0] if spans else scan_from
+        if cut:
+            buf = buf[cut:]
+            spans = [(s - cut, e - cut) for s, e in spans]
+            scan_from -= cut
+        buf += segment
+        yield from scan(final=False)
+
+    yield from scan(final=True)
+    if fresh and spans:
+        yield buf[spans[0][0]:spans[-1][1]]
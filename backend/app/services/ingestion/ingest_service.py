@@ -3,17 +3,32 @@
 from __future__ import annotations
 
 import logging
+import multiprocessing
+import sys
 import uuid
-from typing import List, Optional
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Deque, Iterable, Iterator, List, Optional, Tuple
 
-from app.services.ingestion.chunker import chunk_text
-from app.services.ingestion.loader import gather_documents
+import numpy as np
+
+from app.services.ingestion.chunker import chunk_stream
+from app.services.ingestion.loader import iter_documents, iter_file, resolve_files
+from app.services.rag.embedding_cache import EmbeddingCache, content_hash, simhash
 from app.services.rag.embeddings import EmbeddingService
 from app.services.rag.vector_store import VectorStore
 
 logger = logging.getLogger(__name__)
 
 
+def _chunk_file(path: str, chunk_size: int, chunk_overlap: int) -> Tuple[List[str], Optional[str]]:
+    """Load and chunk one file in a worker process; returns ``(chunks, error)``."""
+    try:
+        return list(chunk_stream(iter_file(path), chunk_size, chunk_overlap)), None
+    except Exception as exc:
+        return [], repr(exc)
+
+
 class IngestionService:
     def __init__(
         self,
@@ -21,40 +36,175 @@ class IngestionService:
         store: VectorStore,
         chunk_size: int = 400,
         chunk_overlap: int = 80,
+        batch_size: int = 32,
+        cache: Optional[EmbeddingCache] = None,
+        prefetch: int = 2,
+        processes: int = 0,
     ) -> None:
         self.embedder = embedder
         self.store = store
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.batch_size = batch_size
+        self.cache = cache
+        self.prefetch = prefetch
+        self.processes = processes
 
     def ingest_paths(
         self,
         paths: List[str],
         tags: Optional[List[str]] = None,
         version: Optional[str] = None,
+        batch_size: Optional[int] = None,
     ) -> int:
-        documents = gather_documents(paths)
-        chunk_texts: List[str] = []
-        metadatas: List[dict] = []
-
-        for doc_path, text in documents:
-            chunks = chunk_text(text, self.chunk_size, self.chunk_overlap)
-            for chunk in chunks:
-                meta = {
-                    "id": str(uuid.uuid4()),
-                    "document_name": doc_path.replace("\\", "/").rsplit("/", 1)[-1],
-                    "source_path": doc_path,
-                    "version": version,
-                    "tags": tags or [],
-                    "text": chunk,
+        """Chunk every document under *paths* and index the chunks.
+
+        Chunks from all documents are pooled and embedded in windows of
+        *batch_size* (defaults to ``self.batch_size``).  Up to
+        ``self.prefetch`` windows are embedded on background threads while
+        the next window is being loaded and chunked; results are added to
+        the store in order.  Documents are streamed page by page, so a
+        large file never has to fit in memory as a single string; a
+        document that fails to load is skipped whole, as in the process
+        pool path.
+
+        With ``self.processes > 1`` files are instead extracted and chunked
+        in a process pool, trading that streaming for parallel PDF parsing
+        and chunking across cores.
+        """
+        batch_size = max(1, batch_size or self.batch_size)
+        if self.processes > 1:
+            documents = self._chunk_in_processes(resolve_files(paths))
+        else:
+            documents = (
+                (doc_path, self._chunks(doc_path, pieces))
+                for doc_path, pieces in iter_documents(paths)
+            )
+        pending_texts: List[str] = []
+        pending_metas: List[dict] = []
+        in_flight: Deque[Tuple[Future, List[str], List[dict]]] = deque()
+        total = 0
+
+        with ThreadPoolExecutor(max_workers=max(1, self.prefetch), thread_name_prefix="embed") as pool:
+
+            def submit(texts: List[str], metas: List[dict]) -> None:
+                nonlocal total
+                if len(in_flight) >= max(1, self.prefetch):
+                    total += self._store(*in_flight.popleft())
+                in_flight.append((pool.submit(self._embed, texts), texts, metas))
+
+            shared_tags = [sys.intern(t) for t in tags or []]
+            shared_version = sys.intern(version) if version else version
+            for doc_path, chunks in documents:
+                # Fields common to every chunk of the document are built once
+                # and shared (the tags list included) rather than per chunk.
+                doc_fields = {
+                    "document_name": sys.intern(doc_path.replace("\\", "/").rsplit("/", 1)[-1]),
+                    "source_path": sys.intern(doc_path),
+                    "version": shared_version,
+                    "tags": shared_tags,
                 }
-                chunk_texts.append(chunk)
-                metadatas.append(meta)
+                for chunk in chunks:
+                    meta = {"id": str(uuid.uuid4()), **doc_fields, "text": chunk}
+                    pending_texts.append(chunk)
+                    pending_metas.append(meta)
+                    if len(pending_texts) >= batch_size:
+                        submit(pending_texts, pending_metas)
+                        pending_texts, pending_metas = [], []
+
+            if pending_texts:
+                submit(pending_texts, pending_metas)
+            while in_flight:
+                total += self._store(*in_flight.popleft())
 
-        if chunk_texts:
-            embeddings = self.embedder.embed_documents(chunk_texts)
-            self.store.add_texts(chunk_texts, embeddings, metadatas)
+        if total:
             self.store.save()
 
-        logger.info("Ingested %d chunks from %d paths", len(chunk_texts), len(paths))
-        return len(chunk_texts)
+        logger.info("Ingested %d chunks from %d paths", total, len(paths))
+        return total
+
+    def _chunks(self, doc_path: str, pieces: Iterator[str]) -> List[str]:
+        """Chunk one streamed document; a read error skips all of it.
+
+        The chunks are collected before any is indexed, so a document that
+        fails midway is never stored truncated.
+        """
+        try:
+            return list(chunk_stream(pieces, self.chunk_size, self.chunk_overlap))
+        except Exception:
+            logger.warning("Failed to load %s, skipping", doc_path, exc_info=True)
+            return []
+
+    def _chunk_in_processes(self, files: List[str]) -> Iterator[Tuple[str, Iterable[str]]]:
+        """Yield ``(path, chunks)`` in file order, chunked by a process pool.
+
+        At most two files per worker are in flight, so finished documents
+        do not pile up in memory while the embedder catches up.  Workers
+        are spawned rather than forked, as the server process is threaded.
+        """
+        if not files:
+            return
+        workers = min(self.processes, len(files))
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            pending: Deque[Tuple[str, Future]] = deque()
+            queue = iter(files)
+            for path in queue:
+                pending.append((path, pool.submit(_chunk_file, path, self.chunk_size, self.chunk_overlap)))
+                if len(pending) >= 2 * workers:
+                    break
+            while pending:
+                path, future = pending.popleft()
+                next_path = next(queue, None)
+                if next_path is not None:
+                    pending.append(
+                        (next_path, pool.submit(_chunk_file, next_path, self.chunk_size, self.chunk_overlap))
+                    )
+                chunks, error = future.result()
+                if error:
+                    logger.warning("Failed to load %s, skipping: %s", path, error)
+                yield path, chunks
+
+    def _store(self, embedded: Future, texts: List[str], metadatas: List[dict]) -> int:
+        """Wait for one embedded window and add it to the store."""
+        self.store.add_texts(texts, embedded.result(), metadatas)
+        return len(texts)
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """Embed *texts*, reusing cached vectors for chunks seen before.
+
+        Exact content hashes are checked first; a remaining chunk whose
+        SimHash is within the cache's ``max_distance`` of a cached chunk
+        (a typo fix, reflowed whitespace) reuses that chunk's vector.  Only
+        genuinely new text reaches the embedder.
+        """
+        if self.cache is None:
+            return np.asarray(self.embedder.embed_documents(texts), dtype=np.float32)
+
+        hashes = [content_hash(t) for t in texts]
+        found = self.cache.get_many(list(set(hashes)))
+        missing: List[int] = []  # first index of each distinct uncached chunk
+        seen = set(found)
+        for i, h in enumerate(hashes):
+            if h not in seen:
+                seen.add(h)
+                missing.append(i)
+        sims = [simhash(texts[i]) for i in missing]
+
+        novel: List[int] = []
+        for i, sh in zip(missing, sims):
+            vec = self.cache.get_similar(sh)
+            if vec is None:
+                novel.append(i)
+            else:
+                found[hashes[i]] = vec
+        if novel:
+            fresh = self.embedder.embed_documents([texts[i] for i in novel])
+            for i, vec in zip(novel, fresh):
+                found[hashes[i]] = vec
+        self.cache.put_many([hashes[i] for i in missing], [found[hashes[i]] for i in missing], sims)
+        logger.debug(
+            "Embedding cache: %d exact hits, %d near-duplicates, %d embedded",
+            len(texts) - len(missing), len(missing) - len(novel), len(novel),
+        )
+        return np.stack([np.asarray(found[h], dtype=np.float32) for h in hashes])
@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
+import codecs
 import csv
 import io
 import json
 import logging
+import mmap
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
-
-from pypdf import PdfReader
+from typing import Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -18,18 +21,21 @@ SUPPORTED_EXTENSIONS = {
     ".json", ".xml", ".csv", ".rst", ".doc", ".docx",
 }
 
+_PLAIN_TEXT = {".md", ".txt", ".rst", ".xml", ".html", ".htm"}
+_WINDOW_BYTES = 1 << 20
+_PDFIUM_LOCK = threading.Lock()
+
 
 def load_file(path: str) -> str:
     ext = Path(path).suffix.lower()
     if ext not in SUPPORTED_EXTENSIONS:
         raise ValueError(f"Unsupported file type: {ext}")
 
-    if ext in {".md", ".txt", ".rst", ".xml", ".html", ".htm"}:
+    if ext in _PLAIN_TEXT:
         return Path(path).read_text(encoding="utf-8", errors="replace")
 
     if ext == ".pdf":
-        reader = PdfReader(path)
-        return "\n".join(page.extract_text() or "" for page in reader.pages)
+        return _load_pdf(path)
 
     if ext == ".json":
         raw = Path(path).read_text(encoding="utf-8", errors="replace")
@@ -40,24 +46,15 @@ def load_file(path: str) -> str:
             return raw
 
     if ext == ".csv":
-        raw = Path(path).read_text(encoding="utf-8", errors="replace")
-        reader_csv = csv.reader(io.StringIO(raw))
-        rows = list(reader_csv)
-        return "\n".join(", ".join(row) for row in rows)
+        with open(path, encoding="utf-8", errors="replace", newline="") as fh:
+            return "\n".join(", ".join(row) for row in csv.reader(fh))
 
     if ext in {".doc", ".docx"}:
         # Best-effort: extract text from docx (ZIP-based) or return raw text
         try:
-            import zipfile
-            import xml.etree.ElementTree as ET
-
-            with zipfile.ZipFile(path) as z:
-                if "word/document.xml" in z.namelist():
-                    xml_content = z.read("word/document.xml")
-                    tree = ET.fromstring(xml_content)
-                    ns = {"w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"}
-                    texts = [node.text for node in tree.iter("{%s}t" % ns["w"]) if node.text]
-                    return " ".join(texts)
+            text = _load_docx(path)
+            if text is not None:
+                return text
         except Exception:
             pass
         # Fallback: read as bytes and decode
@@ -69,18 +66,167 @@ def load_file(path: str) -> str:
     raise ValueError(f"Unsupported file type: {ext}")
 
 
-def gather_documents(paths: List[str]) -> List[Tuple[str, str]]:
-    """Return ``[(path, text), ...]``.  Accepts files or directories."""
-    docs: List[Tuple[str, str]] = []
+_DOCX_TEXT_TAG = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}t"
+
+
+def _load_docx(path: str) -> Optional[str]:
+    """Return the text runs of a .docx, or None if it has no document part.
+
+    The XML is parsed incrementally and each element is cleared once seen,
+    so the full DOM of a long document is never built.
+    """
+    import xml.etree.ElementTree as ET
+    import zipfile
+
+    with zipfile.ZipFile(path) as z:
+        if "word/document.xml" not in z.namelist():
+            return None
+        texts: List[str] = []
+        with z.open("word/document.xml") as fh:
+            for _, elem in ET.iterparse(fh, events=("end",)):
+                if elem.tag == _DOCX_TEXT_TAG and elem.text:
+                    texts.append(elem.text)
+                elem.clear()
+        return " ".join(texts)
+
+
+def iter_file(path: str) -> Iterator[str]:
+    """Yield the text of *path* in pieces rather than as one string.
+
+    PDFs yield one page at a time and plain-text formats yield decoded
+    windows of a memory-mapped file; other formats are small enough in
+    practice to load whole.
+    Joining the pieces gives the same text as :func:`load_file`.
+    """
+    ext = Path(path).suffix.lower()
+    if ext == ".pdf":
+        for i, page in enumerate(_iter_pdf(path)):
+            yield f"\n{page}" if i else page
+    elif ext in _PLAIN_TEXT:
+        yield from _iter_text(path)
+    else:
+        yield load_file(path)
+
+
+def _iter_text(path: str) -> Iterator[str]:
+    """Decode a UTF-8 file window by window from a read-only mmap.
+
+    The OS pages the file in on demand, so peak memory is one window
+    regardless of file size.  The incremental decoders keep multi-byte
+    characters and ``\\r\\n`` pairs intact across window boundaries, and
+    newlines are translated as ``read_text`` would.
+    """
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder("utf-8")(errors="replace"), translate=True
+    )
+    with open(path, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for offset in range(0, len(mm), _WINDOW_BYTES):
+                text = decoder.decode(mm[offset:offset + _WINDOW_BYTES])
+                if text:
+                    yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _load_pdf(path: str) -> str:
+    return "\n".join(_iter_pdf(path))
+
+
+def _iter_pdf(path: str) -> Iterator[str]:
+    """Yield PDF page text with PDFium (native), falling back to pure-Python pypdf."""
+    try:
+        import pypdfium2 as pdfium
+    except ImportError:
+        from pypdf import PdfReader
+
+        for page in PdfReader(path).pages:
+            yield page.extract_text() or ""
+        return
+
+    # PDFium is not thread-safe and ingests run on worker threads, so every
+    # call into it holds the lock; it is released while each page is yielded.
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(path)
+        pages = len(pdf)
+    try:
+        for i in range(pages):
+            with _PDFIUM_LOCK:
+                page = pdf[i]
+                textpage = page.get_textpage()
+                text = textpage.get_text_range()
+                textpage.close()
+                page.close()
+            yield text
+    finally:
+        with _PDFIUM_LOCK:
+            pdf.close()
+
+
+def _walk_supported(root: str) -> List[str]:
+    """Recursively list supported files under *root* using ``os.scandir``."""
+    found: List[str] = []
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file() and Path(entry.name).suffix.lower() in SUPPORTED_EXTENSIONS:
+                    found.append(entry.path)
+    return sorted(found)
+
+
+def _load_with_path(path: str) -> Tuple[str, str]:
+    try:
+        return path, load_file(path)
+    except ValueError:
+        raise
+    except Exception as exc:
+        raise ValueError(f"Failed to load {path}: {exc}") from exc
+
+
+def resolve_files(paths: List[str]) -> List[str]:
+    """Expand *paths* (files or directories) into the supported files to load."""
+    files: List[str] = []
     for p in paths:
         path_obj = Path(p)
         if not path_obj.exists():
             logger.warning("Path does not exist, skipping: %s", p)
             continue
         if path_obj.is_dir():
-            for child in sorted(path_obj.rglob("*")):
-                if child.is_file() and child.suffix.lower() in SUPPORTED_EXTENSIONS:
-                    docs.append((str(child), load_file(str(child))))
+            files.extend(_walk_supported(str(path_obj)))
         else:
-            docs.append((str(path_obj), load_file(str(path_obj))))
-    return docs
+            ext = path_obj.suffix.lower()
+            if ext not in SUPPORTED_EXTENSIONS:
+                raise ValueError(f"Unsupported file type: {ext}")
+            files.append(str(path_obj))
+    return files
+
+
+def gather_documents(paths: List[str], max_workers: Optional[int] = None) -> List[Tuple[str, str]]:
+    """Return ``[(path, text), ...]``.  Accepts files or directories.
+
+    Files are read on a bounded thread pool since loading is dominated by
+    disk I/O (PDF parsing itself is serialized, see :func:`_iter_pdf`).  A
+    file that fails to load raises ``ValueError`` naming it.
+    """
+    files = resolve_files(paths)
+    if not files:
+        return []
+    workers = max_workers or min(8, (os.cpu_count() or 1) * 2, len(files))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_load_with_path, files))
+
+
+def iter_documents(paths: List[str]) -> Iterator[Tuple[str, Iterator[str]]]:
+    """Yield ``(path, pieces)`` lazily, one document at a time.
+
+    Unlike :func:`gather_documents` nothing is read until the caller
+    consumes *pieces*, so only one page or block is held in memory.
+    """
+    for path in resolve_files(paths):
+        yield path, iter_file(path)
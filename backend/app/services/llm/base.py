@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Generator
+from typing import AsyncIterator, Generator, List
 
 
 class LLMClient(ABC):
@@ -18,6 +19,21 @@ class LLMClient(ABC):
         """Stream tokens one chunk at a time.  Default falls back to generate()."""
         yield self.generate(prompt, system_prompt)
 
+    async def agenerate(self, prompt: str, system_prompt: str = "") -> str:
+        """Async ``generate()``.  Default runs the blocking call in a thread."""
+        return await asyncio.to_thread(self.generate, prompt, system_prompt)
+
+    async def agenerate_many(self, prompts: List[str], system_prompt: str = "") -> List[str]:
+        """Generate completions for *prompts* concurrently, in order."""
+        return list(await asyncio.gather(*(self.agenerate(p, system_prompt) for p in prompts)))
+
+    async def agenerate_stream(self, prompt: str, system_prompt: str = "") -> AsyncIterator[str]:
+        """Async ``generate_stream()``.  Default pulls the blocking stream from a thread."""
+        done = object()
+        chunks = iter(self.generate_stream(prompt, system_prompt))
+        while (chunk := await asyncio.to_thread(next, chunks, done)) is not done:
+            yield chunk
+
     @abstractmethod
     def health_check(self) -> bool:
         """Return ``True`` when the LLM backend is reachable."""
@@ -2,17 +2,85 @@
 
 from __future__ import annotations
 
+import importlib.util
 import logging
+import time
+from typing import Any, AsyncIterator, Generator, Optional, Tuple
 
 import httpx
+import orjson
 
 from app.services.llm.base import LLMClient
 
 logger = logging.getLogger(__name__)
 
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+
+def _chat_payload(client: Any, prompt: str, system_prompt: str) -> dict:
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": prompt})
+
+    return {
+        "model": client.model,
+        "messages": messages,
+        "temperature": client.temperature,
+        "top_p": client.top_p,
+        "max_tokens": client.max_tokens,
+    }
+
+
+def _sse_delta(line: str) -> Tuple[bool, str]:
+    """Parse one SSE line into ``(done, content)``."""
+    if not line.startswith("data:"):
+        return False, ""
+    data = line[5:].strip()
+    if data == "[DONE]":
+        return True, ""
+    try:
+        choices = orjson.loads(data).get("choices")
+    except orjson.JSONDecodeError:
+        return False, ""
+    delta = choices[0].get("delta") if choices else None
+    return False, (delta.get("content") if delta else None) or ""
+
+
+def _model_entries(data: dict) -> list[dict]:
+    # OpenAI-compatible APIs return {"data": [{"id": ...}, ...]}
+    models = data.get("data", [])
+    return [{"id": m.get("id", "unknown"), "owned_by": m.get("owned_by", "")} for m in models]
+
+
+def _connection_result(resp: httpx.Response) -> dict:
+    if resp.status_code == 200:
+        count = len(resp.json().get("data", []))
+        return {
+            "success": True,
+            "message": f"Connected successfully. {count} model(s) available.",
+            "models_count": count,
+        }
+    elif resp.status_code == 401:
+        return {"success": False, "message": "Authentication failed. Check your API key."}
+    else:
+        return {"success": False, "message": f"Server returned status {resp.status_code}."}
+
+
+def _connection_error(exc: Exception) -> dict:
+    if isinstance(exc, httpx.ConnectError):
+        return {"success": False, "message": "Could not connect. Check the base URL."}
+    return {"success": False, "message": f"Connection error: {exc}"}
+
 
 class CloudLLMClient(LLMClient):
-    """Connect to an OpenAI-compatible chat-completion endpoint."""
+    """Connect to an OpenAI-compatible chat-completion endpoint.
+
+    The sync methods share one pooled ``httpx.Client`` (*http_client*).
+    ``agenerate`` and ``agenerate_stream`` run on an ``httpx.AsyncClient``
+    (*async_http_client*, or one created lazily on the running event loop),
+    so many completions can be in flight without a thread each.
+    """
 
     def __init__(
         self,
@@ -22,6 +90,9 @@ class CloudLLMClient(LLMClient):
         temperature: float = 0.2,
         top_p: float = 0.9,
         max_tokens: int = 512,
+        http_client: Optional[httpx.Client] = None,
+        async_http_client: Optional[httpx.AsyncClient] = None,
+        models_ttl: float = 30.0,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.model = model
@@ -29,40 +100,107 @@ class CloudLLMClient(LLMClient):
         self.temperature = temperature
         self.top_p = top_p
         self.max_tokens = max_tokens
-        self._client = httpx.Client(
-            timeout=60.0,
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            },
-        )
+        self.models_ttl = models_ttl
+        self._models_cache: Optional[Tuple[float, httpx.Response]] = None
+        # Auth travels per request so a shared, pooled client can be injected.
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        self._timeout = httpx.Timeout(60.0, connect=5.0)
+        self._client = http_client or httpx.Client(timeout=self._timeout)
+        self._aclient = async_http_client
         logger.info("CloudLLMClient initialised: url=%s model=%s", self.base_url, self.model)
 
     def generate(self, prompt: str, system_prompt: str = "") -> str:
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "temperature": self.temperature,
-            "top_p": self.top_p,
-            "max_tokens": self.max_tokens,
-        }
         response = self._client.post(
+            f"{self.base_url}/chat/completions",
+            json=_chat_payload(self, prompt, system_prompt),
+            headers=self._headers,
+            timeout=self._timeout,
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data["choices"][0]["message"]["content"].strip()
+
+    def generate_stream(self, prompt: str, system_prompt: str = "") -> Generator[str, None, None]:
+        """Yield content deltas from the server-sent event stream."""
+        payload = {**_chat_payload(self, prompt, system_prompt), "stream": True}
+        with self._client.stream(
+            "POST",
             f"{self.base_url}/chat/completions",
             json=payload,
+            headers=self._headers,
+            timeout=self._timeout,
+        ) as resp:
+            resp.raise_for_status()
+            for line in resp.iter_lines():
+                done, chunk = _sse_delta(line)
+                if done:
+                    break
+                if chunk:
+                    yield chunk
+
+    async def agenerate(self, prompt: str, system_prompt: str = "") -> str:
+        """Async ``generate()`` over a pooled ``httpx.AsyncClient``."""
+        response = await self._async_client().post(
+            f"{self.base_url}/chat/completions",
+            json=_chat_payload(self, prompt, system_prompt),
+            headers=self._headers,
+            timeout=self._timeout,
         )
         response.raise_for_status()
         data = response.json()
         return data["choices"][0]["message"]["content"].strip()
 
+    async def agenerate_stream(self, prompt: str, system_prompt: str = "") -> AsyncIterator[str]:
+        """Async ``generate_stream()``: yield deltas without tying up a thread."""
+        payload = {**_chat_payload(self, prompt, system_prompt), "stream": True}
+        async with self._async_client().stream(
+            "POST",
+            f"{self.base_url}/chat/completions",
+            json=payload,
+            headers=self._headers,
+            timeout=self._timeout,
+        ) as resp:
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                done, chunk = _sse_delta(line)
+                if done:
+                    break
+                if chunk:
+                    yield chunk
+
+    def _async_client(self) -> httpx.AsyncClient:
+        if self._aclient is None:
+            self._aclient = httpx.AsyncClient(
+                http2=_HTTP2,
+                timeout=self._timeout,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            )
+        return self._aclient
+
+    def _get_models(self) -> httpx.Response:
+        """GET ``/models``, reusing the last response for ``models_ttl`` seconds.
+
+        Health checks, model listing and connection tests all read this
+        endpoint, and UI polling would otherwise hit it on every refresh.
+        Only 200 responses are cached; errors and non-2xx replies are
+        retried on the next call.
+        """
+        now = time.monotonic()
+        if self._models_cache is not None and now - self._models_cache[0] < self.models_ttl:
+            return self._models_cache[1]
+        resp = self._client.get(
+            f"{self.base_url}/models", headers=self._headers, timeout=self._timeout
+        )
+        if resp.status_code == 200:
+            self._models_cache = (now, resp)
+        return resp
+
     def health_check(self) -> bool:
         try:
-            resp = self._client.get(f"{self.base_url}/models")
-            return resp.status_code == 200
+            return self._get_models().status_code == 200
         except Exception:
             return False
 
@@ -72,12 +210,9 @@ class CloudLLMClient(LLMClient):
         Returns a list of dicts with at least an ``id`` key.
         """
         try:
-            resp = self._client.get(f"{self.base_url}/models")
+            resp = self._get_models()
             resp.raise_for_status()
-            data = resp.json()
-            # OpenAI-compatible APIs return {"data": [{"id": ...}, ...]}
-            models = data.get("data", [])
-            return [{"id": m.get("id", "unknown"), "owned_by": m.get("owned_by", "")} for m in models]
+            return _model_entries(resp.json())
         except Exception as exc:
             logger.warning("Failed to list cloud models: %s", exc)
             return []
@@ -88,20 +223,6 @@ class CloudLLMClient(LLMClient):
         Returns a dict with ``success``, ``message``, and optionally ``models_count``.
         """
         try:
-            resp = self._client.get(f"{self.base_url}/models")
-            if resp.status_code == 200:
-                data = resp.json()
-                count = len(data.get("data", []))
-                return {
-                    "success": True,
-                    "message": f"Connected successfully. {count} model(s) available.",
-                    "models_count": count,
-                }
-            elif resp.status_code == 401:
-                return {"success": False, "message": "Authentication failed. Check your API key."}
-            else:
-                return {"success": False, "message": f"Server returned status {resp.status_code}."}
-        except httpx.ConnectError:
-            return {"success": False, "message": "Could not connect. Check the base URL."}
+            return _connection_result(self._get_models())
         except Exception as exc:
-            return {"success": False, "message": f"Connection error: {exc}"}
+            return _connection_error(exc)
@@ -7,15 +7,74 @@ for conversational use-cases with system / user / assistant roles.
 
 from __future__ import annotations
 
+import asyncio
+import importlib.util
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
 
 import httpx
+import orjson
 
 from app.services.llm.base import LLMClient
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 is negotiated via TLS ALPN, so it applies to an HTTPS-fronted remote
+# Ollama; streams to a plain-HTTP server stay on pooled HTTP/1.1 connections.
+_HTTP2 = importlib.util.find_spec("h2") is not None
+# Generations can take minutes; an unreachable server should fail fast.
+_TIMEOUT = httpx.Timeout(120.0, connect=5.0)
+
+_MODELS_TTL = 60.0
+# base_url -> (monotonic time, models) from the last successful /api/tags
+_models_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+_models_lock = threading.Lock()
+
+
+# Called once per streamed token: no throwaway ``{}`` defaults.
+def _chat_content(data: dict) -> str:
+    message = data.get("message")
+    return (message.get("content") if message else None) or ""
+
+
+def _generate_content(data: dict) -> str:
+    return data.get("response") or ""
+
+
+class _NDJSONSplitter:
+    """Split a byte stream into NDJSON lines without decoding it to ``str``.
+
+    Lines are handed to ``orjson.loads`` as bytes, so each token costs one
+    slice instead of a UTF-8 decode plus a ``str`` per line.
+    """
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+
+    def feed(self, chunk: bytes) -> Iterator[bytes]:
+        buf = self._buf
+        buf.extend(chunk)
+        start = 0
+        while (nl := buf.find(b"\n", start)) != -1:
+            if nl > start:
+                yield bytes(buf[start:nl])
+            start = nl + 1
+        del buf[:start]
+
+    def tail(self) -> Iterator[bytes]:
+        if self._buf.strip():
+            yield bytes(self._buf)
+        self._buf.clear()
+
+
+def _parse_line(line: bytes) -> Optional[dict]:
+    try:
+        return orjson.loads(line)
+    except orjson.JSONDecodeError:
+        return None
+
 
 class OllamaClient(LLMClient):
     """Connect to a running Ollama instance at *base_url*.
@@ -31,6 +90,22 @@ class OllamaClient(LLMClient):
     use_chat_api:
         When *True* (default), call ``/api/chat`` (message-array style).
         Set to *False* to fall back to the legacy ``/api/generate`` endpoint.
+    http_client:
+        Optional shared ``httpx.Client`` so the connection pool outlives
+        this instance.  A private client is created when omitted.
+    async_http_client:
+        Optional ``httpx.AsyncClient`` for the ``agenerate*`` methods.  One
+        is created lazily, on the running event loop, when omitted.
+    validate_model:
+        When *True* (default), the first use of :attr:`model` checks the
+        requested tag against the server and falls back to the first
+        installed model.  The model list is cached per server for 60 s, so
+        constructing a client never makes an HTTP call.
+
+    Concurrent requests (``agenerate_many``) only overlap on the server
+    when Ollama is started with ``OLLAMA_NUM_PARALLEL`` > 1; otherwise they
+    queue.  ``OLLAMA_MAX_LOADED_MODELS`` bounds how many models stay resident
+    when several are used at once.
     """
 
     def __init__(
@@ -41,24 +116,47 @@ class OllamaClient(LLMClient):
         top_p: float = 0.9,
         max_tokens: int = 512,
         use_chat_api: bool = True,
+        http_client: Optional[httpx.Client] = None,
+        async_http_client: Optional[httpx.AsyncClient] = None,
+        validate_model: bool = True,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.temperature = temperature
         self.top_p = top_p
         self.max_tokens = max_tokens
         self.use_chat_api = use_chat_api
-        self._client = httpx.Client(timeout=120.0)
-        
-        # Auto-detect available model if configured one doesn't exist
-        self.model = self._validate_or_select_model(model)
-        
+        self._client = http_client or httpx.Client(
+            http2=_HTTP2, timeout=_TIMEOUT
+        )
+        self._aclient = async_http_client
+        self._requested_model = model
+        self._model: Optional[str] = None if validate_model else model
+
         logger.info(
             "OllamaClient initialised: url=%s model=%s chat_api=%s",
             self.base_url,
-            self.model,
+            model,
             self.use_chat_api,
         )
 
+    @property
+    def model(self) -> str:
+        """Active model tag, validated against the server on first use."""
+        if self._model is None:
+            # Auto-detect available model if configured one doesn't exist
+            self._model = self._validate_or_select_model(self._requested_model)
+        return self._model
+
+    @model.setter
+    def model(self, value: str) -> None:
+        self._model = value
+
+    async def aresolve_model(self) -> str:
+        """Async :attr:`model`: validates in a thread so the event loop never waits on it."""
+        if self._model is None:
+            return await asyncio.to_thread(lambda: self.model)
+        return self._model
+
     # ── LLMClient interface ─────────────────────────────
 
     def generate(self, prompt: str, system_prompt: str = "") -> str:
@@ -71,10 +169,63 @@ class OllamaClient(LLMClient):
             return self._chat(prompt, system_prompt)
         return self._generate(prompt, system_prompt)
 
+    async def agenerate(self, prompt: str, system_prompt: str = "") -> str:
+        """Async ``generate()`` over a pooled ``httpx.AsyncClient``."""
+        await self.aresolve_model()
+        if self.use_chat_api:
+            payload = self._chat_payload(prompt, system_prompt, stream=False)
+            response = await self._async_client().post(f"{self.base_url}/api/chat", json=payload)
+            response.raise_for_status()
+            return _chat_content(response.json()).strip()
+        payload = self._generate_payload(prompt, system_prompt, stream=False)
+        response = await self._async_client().post(f"{self.base_url}/api/generate", json=payload)
+        response.raise_for_status()
+        return response.json().get("response", "").strip()
+
+    async def agenerate_stream(self, prompt: str, system_prompt: str = "") -> AsyncIterator[str]:
+        """Async ``generate_stream()``: yield tokens without tying up a thread."""
+        await self.aresolve_model()
+        if self.use_chat_api:
+            endpoint, extract = "/api/chat", _chat_content
+            payload = self._chat_payload(prompt, system_prompt, stream=True)
+        else:
+            endpoint, extract = "/api/generate", _generate_content
+            payload = self._generate_payload(prompt, system_prompt, stream=True)
+        async with self._async_client().stream(
+            "POST", f"{self.base_url}{endpoint}", json=payload, timeout=_TIMEOUT
+        ) as resp:
+            resp.raise_for_status()
+            lines = _NDJSONSplitter()
+            async for raw in resp.aiter_bytes():
+                for line in lines.feed(raw):
+                    data = _parse_line(line)
+                    if data is None:
+                        continue
+                    chunk = extract(data)
+                    if chunk:
+                        yield chunk
+                    if data.get("done"):
+                        return
+            for line in lines.tail():
+                data = _parse_line(line)
+                if data is not None and (chunk := extract(data)):
+                    yield chunk
+
+    def _async_client(self) -> httpx.AsyncClient:
+        if self._aclient is None:
+            self._aclient = httpx.AsyncClient(
+                http2=_HTTP2,
+                timeout=_TIMEOUT,
+                limits=httpx.Limits(
+                    max_keepalive_connections=32, max_connections=64, keepalive_expiry=300.0
+                ),
+            )
+        return self._aclient
+
     def health_check(self) -> bool:
-        """Ping the Ollama server via ``/api/tags``."""
+        """Ping the Ollama server via ``/api/version`` (tiny, unlike the model list)."""
         try:
-            resp = self._client.get(f"{self.base_url}/api/tags")
+            resp = self._client.get(f"{self.base_url}/api/version")
             return resp.status_code == 200
         except Exception:
             return False
@@ -84,7 +235,7 @@ class OllamaClient(LLMClient):
     def _validate_or_select_model(self, requested_model: str) -> str:
         """Validate the requested model exists, or auto-select first available."""
         try:
-            models = self.list_models()
+            models = self._cached_models()
             if not models:
                 logger.warning("No models found on Ollama server, using requested model: %s", requested_model)
                 return requested_model
@@ -109,16 +260,28 @@ class OllamaClient(LLMClient):
             logger.warning("Failed to validate model, using requested model: %s", requested_model, exc_info=True)
             return requested_model
 
+    def _cached_models(self) -> List[Dict[str, Any]]:
+        """Model list for this server, reused for up to ``_MODELS_TTL`` seconds."""
+        with _models_lock:
+            cached = _models_cache.get(self.base_url)
+        if cached is not None and time.monotonic() - cached[0] < _MODELS_TTL:
+            return cached[1]
+        return self.list_models()
+
     def list_models(self) -> List[Dict[str, Any]]:
         """Return the list of models available on the Ollama server.
 
         Each entry is a dict with at least ``"name"`` and ``"size"`` keys.
-        Returns an empty list when the server is unreachable.
+        Returns an empty list when the server is unreachable.  Always
+        fetches, and refreshes the list used for model validation.
         """
         try:
             resp = self._client.get(f"{self.base_url}/api/tags")
             resp.raise_for_status()
-            return resp.json().get("models", [])
+            models = resp.json().get("models", [])
+            with _models_lock:
+                _models_cache[self.base_url] = (time.monotonic(), models)
+            return models
         except Exception:
             logger.warning("Failed to list Ollama models", exc_info=True)
             return []
@@ -149,36 +312,41 @@ class OllamaClient(LLMClient):
             "num_predict": self.max_tokens,
         }
 
-    def _chat(self, prompt: str, system_prompt: str = "") -> str:
-        """Call ``/api/chat`` — the message-array endpoint."""
+    def _chat_payload(self, prompt: str, system_prompt: str, stream: bool) -> dict:
         messages: List[Dict[str, str]] = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
 
-        payload: dict = {
+        return {
             "model": self.model,
             "messages": messages,
-            "stream": False,
+            "stream": stream,
             "options": self._options(),
         }
 
-        response = self._client.post(f"{self.base_url}/api/chat", json=payload)
-        response.raise_for_status()
-        data = response.json()
-        return data.get("message", {}).get("content", "").strip()
-
-    def _generate(self, prompt: str, system_prompt: str = "") -> str:
-        """Call ``/api/generate`` — the legacy raw-prompt endpoint."""
+    def _generate_payload(self, prompt: str, system_prompt: str, stream: bool) -> dict:
         payload: dict = {
             "model": self.model,
             "prompt": prompt,
-            "stream": False,
+            "stream": stream,
             "options": self._options(),
         }
         if system_prompt:
             payload["system"] = system_prompt
+        return payload
 
+    def _chat(self, prompt: str, system_prompt: str = "") -> str:
+        """Call ``/api/chat`` — the message-array endpoint."""
+        payload = self._chat_payload(prompt, system_prompt, stream=False)
+        response = self._client.post(f"{self.base_url}/api/chat", json=payload)
+        response.raise_for_status()
+        data = response.json()
+        return _chat_content(data).strip()
+
+    def _generate(self, prompt: str, system_prompt: str = "") -> str:
+        """Call ``/api/generate`` — the legacy raw-prompt endpoint."""
+        payload = self._generate_payload(prompt, system_prompt, stream=False)
         response = self._client.post(f"{self.base_url}/api/generate", json=payload)
         response.raise_for_status()
         data = response.json()
@@ -186,69 +354,35 @@ class OllamaClient(LLMClient):
 
     # ── Streaming support ───────────────────────────────
 
-    def generate_stream(self, prompt: str, system_prompt: str = ""):
+    def generate_stream(self, prompt: str, system_prompt: str = "") -> Iterator[str]:
         """Yield each token/chunk from the Ollama streaming response."""
-        import json as _json
         if self.use_chat_api:
-            yield from self._chat_stream(prompt, system_prompt)
+            payload = self._chat_payload(prompt, system_prompt, stream=True)
+            yield from self._stream("/api/chat", payload, _chat_content)
         else:
-            yield from self._generate_stream(prompt, system_prompt)
-
-    def _chat_stream(self, prompt: str, system_prompt: str = ""):
-        import json as _json
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "stream": True,
-            "options": self._options(),
-        }
-
-        with self._client.stream(
-            "POST", f"{self.base_url}/api/chat", json=payload, timeout=120.0
-        ) as resp:
-            resp.raise_for_status()
-            for line in resp.iter_lines():
-                if not line:
-                    continue
-                try:
-                    data = _json.loads(line)
-                    chunk = data.get("message", {}).get("content", "")
-                    if chunk:
-                        yield chunk
-                    if data.get("done"):
-                        break
-                except _json.JSONDecodeError:
-                    continue
-
-    def _generate_stream(self, prompt: str, system_prompt: str = ""):
-        import json as _json
-        payload = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": True,
-            "options": self._options(),
-        }
-        if system_prompt:
-            payload["system"] = system_prompt
+            payload = self._generate_payload(prompt, system_prompt, stream=True)
+            yield from self._stream("/api/generate", payload, _generate_content)
 
+    def _stream(
+        self, endpoint: str, payload: dict, extract: Callable[[dict], str]
+    ) -> Iterator[str]:
+        """POST *payload* and yield ``extract(obj)`` for each NDJSON line until ``done``."""
         with self._client.stream(
-            "POST", f"{self.base_url}/api/generate", json=payload, timeout=120.0
+            "POST", f"{self.base_url}{endpoint}", json=payload, timeout=_TIMEOUT
         ) as resp:
             resp.raise_for_status()
-            for line in resp.iter_lines():
-                if not line:
-                    continue
-                try:
-                    data = _json.loads(line)
-                    chunk = data.get("response", "")
+            lines = _NDJSONSplitter()
+            for raw in resp.iter_bytes():
+                for line in lines.feed(raw):
+                    data = _parse_line(line)
+                    if data is None:
+                        continue
+                    chunk = extract(data)
                     if chunk:
                         yield chunk
                     if data.get("done"):
-                        break
-                except _json.JSONDecodeError:
-                    continue
+                        return
+            for line in lines.tail():
+                data = _parse_line(line)
+                if data is not None and (chunk := extract(data)):
+                    yield chunk
@@ -0,0 +1,66 @@
+"""Micro-batching of concurrent retrieval calls."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Callable, Generic, List, Optional, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class BatchingSearcher(Generic[T, R]):
+    """Coalesce concurrent :meth:`search` calls into one batched call.
+
+    The first call to arrive opens a short window (``window`` seconds); every
+    call made within it joins the batch, which is then handed to
+    ``search_many`` in a worker thread.  A batch reaching ``max_batch``
+    is dispatched at once.  ``search_many`` must return one result per item,
+    in order.
+    """
+
+    def __init__(
+        self,
+        search_many: Callable[[List[T]], List[R]],
+        window: float = 0.005,
+        max_batch: int = 64,
+    ) -> None:
+        self.search_many = search_many
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # The loop only keeps weak references to tasks; hold in-flight ones here.
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def search(self, item: T) -> R:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, batch: List[Tuple[T, asyncio.Future]]) -> None:
+        try:
+            results = await asyncio.to_thread(self.search_many, [item for item, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,148 @@
+"""Persistent embedding cache — SQLite keyed by chunk content hash."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_BANDS = 4  # 16-bit SimHash bands; any match within 3 bits shares one
+_MASK16 = 0xFFFF
+
+
+def content_hash(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of the words in *text*, weighted by frequency.
+
+    Typo fixes and whitespace changes flip only a few bits, so near-identical
+    chunks land within a small Hamming distance of each other.
+    """
+    counts = Counter(text.split())
+    if not counts:
+        return 0
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(w.encode("utf-8"), digest_size=8).digest(), "little") for w in counts],
+        dtype=np.uint64,
+    )
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    weights = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+    score = (weights[:, None] * (2 * bits.astype(np.int64) - 1)).sum(axis=0)
+    return int.from_bytes(np.packbits(score > 0, bitorder="little").tobytes(), "little")
+
+
+def _bands(sh: int) -> List[int]:
+    return [(sh >> (16 * i)) & _MASK16 for i in range(_BANDS)]
+
+
+def _to_sql(sh: int) -> int:
+    """SQLite integers are signed 64-bit."""
+    return sh - (1 << 64) if sh >= 1 << 63 else sh
+
+
+class EmbeddingCache:
+    """Store one embedding per ``(sha256(text), model)`` on disk.
+
+    Vectors are kept as float16 (half the bytes; negligible effect on
+    cosine ranking of normalised embeddings) and returned as float32 arrays.
+    Each entry also records the chunk's SimHash, so :meth:`get_similar` can
+    reuse an embedding for a chunk that differs only by a few words.
+    """
+
+    def __init__(self, path: str, model_name: str, max_distance: int = 3) -> None:
+        if max_distance >= _BANDS:
+            raise ValueError(f"max_distance must be below {_BANDS}")
+        self.path = path
+        self.model_name = model_name
+        self.max_distance = max_distance
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " sha256 BLOB NOT NULL,"
+            " model TEXT NOT NULL,"
+            " dim INTEGER NOT NULL,"
+            " vector BLOB NOT NULL,"
+            " PRIMARY KEY (sha256, model))"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(embeddings)")}
+        for col in ["simhash", *(f"b{i}" for i in range(_BANDS))]:
+            if col not in columns:
+                self._conn.execute(f"ALTER TABLE embeddings ADD COLUMN {col} INTEGER")
+        for i in range(_BANDS):
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS embeddings_b{i} ON embeddings (model, b{i})"
+            )
+        self._conn.commit()
+
+    def get_many(self, hashes: Sequence[bytes]) -> Dict[bytes, np.ndarray]:
+        """Return the cached vectors for whichever *hashes* are present."""
+        if not hashes:
+            return {}
+        placeholders = ",".join("?" * len(hashes))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT sha256, vector FROM embeddings WHERE model = ? AND sha256 IN ({placeholders})",
+                (self.model_name, *hashes),
+            ).fetchall()
+        return {bytes(h): self._decode(v) for h, v in rows}
+
+    def get_similar(self, sh: int) -> Optional[np.ndarray]:
+        """Return the vector of the closest cached chunk within ``max_distance`` bits."""
+        if self.max_distance < 0:
+            return None
+        bands = _bands(sh)
+        where = " OR ".join(f"b{i} = ?" for i in range(_BANDS))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT simhash, vector FROM embeddings WHERE model = ? AND ({where})",
+                (self.model_name, *bands),
+            ).fetchall()
+        best = None
+        for cached, vector in rows:
+            distance = ((cached & (2**64 - 1)) ^ sh).bit_count()
+            if distance <= self.max_distance and (best is None or distance < best[0]):
+                best = (distance, vector)
+        return self._decode(best[1]) if best else None
+
+    def put_many(
+        self,
+        hashes: Sequence[bytes],
+        vectors: Sequence[Sequence[float]],
+        simhashes: Optional[Sequence[int]] = None,
+    ) -> None:
+        if not hashes:
+            return
+        rows = []
+        for h, v, sh in zip(hashes, vectors, simhashes or [None] * len(hashes)):
+            bands = _bands(sh) if sh is not None else [None] * _BANDS
+            rows.append((
+                h, self.model_name, len(v), np.asarray(v, dtype=np.float16).tobytes(),
+                _to_sql(sh) if sh is not None else None, *bands,
+            ))
+        columns = ", ".join(["sha256", "model", "dim", "vector", "simhash", *(f"b{i}" for i in range(_BANDS))])
+        placeholders = ",".join("?" * (5 + _BANDS))
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO embeddings ({columns}) VALUES ({placeholders})", rows
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def _decode(blob: bytes) -> np.ndarray:
+        return np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -2,9 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, AsyncIterator, Hashable, List, Optional, Tuple
+
+from app.services.rag.batching import BatchingSearcher
 
 from typing import TYPE_CHECKING
 
@@ -19,6 +25,24 @@ _REFUSAL = (
     "I can only help with questions related to Nexa. "
     "This information is not available in the documentation."
 )
+_PROMPT_SUFFIX = "\nAnswer concisely using only the context."
+
+
+def _sources(hits: List[Tuple[str, float, dict]]) -> List[str]:
+    """Distinct document names, in ranking order."""
+    return list(dict.fromkeys(h[2].get("document_name", "unknown") for h in hits))
+
+
+def _clip(text: str, limit: int) -> str:
+    """Cut *text* to at most *limit* chars, preferring a sentence or word boundary."""
+    if limit <= 0 or len(text) <= limit:
+        return text
+    cut = text[:limit]
+    for sep in (". ", "\n", " "):
+        end = cut.rfind(sep)
+        if end >= limit // 2:
+            return cut[: end + 1].rstrip()
+    return cut
 
 
 class RAGPipeline:
@@ -31,46 +55,173 @@ class RAGPipeline:
         rag_prompt_path: str,
         top_k: int = 4,
         similarity_threshold: float = 0.35,
+        batch_window: float = 0.005,
+        max_context_chars: int = 1200,
+        retrieval_cache_size: int = 512,
     ) -> None:
         self.embedder = embedder
         self.store = store
         self.llm = llm
-        self.system_prompt = Path(system_prompt_path).read_text(encoding="utf-8")
-        self.rag_prompt = Path(rag_prompt_path).read_text(encoding="utf-8")
+        self.system_prompt_path = system_prompt_path
+        self.rag_prompt_path = rag_prompt_path
+        self.reload_prompts()
         self.top_k = top_k
         self.similarity_threshold = similarity_threshold
+        # Prompt length drives prefill time; each chunk is clipped to this (0 = whole chunk).
+        self.max_context_chars = max_context_chars
+        # Async callers arriving within ``batch_window`` seconds share one
+        # embed + search call; 0 retrieves each query on its own.
+        self._searcher = (
+            BatchingSearcher(self._retrieve_many, window=batch_window) if batch_window > 0 else None
+        )
+        # LRU of recent retrievals, keyed by normalized query, retrieval
+        # settings and the store's generation (bumped on every add).
+        self._hits_cache: OrderedDict[Hashable, List[Tuple[str, float, dict]]] = OrderedDict()
+        self._hits_cache_size = retrieval_cache_size
+        self._hits_lock = threading.Lock()
 
-    # ── internal helpers ────────────────────────────────
+    def reload_prompts(self) -> None:
+        """Read both prompt files once; call again after they are edited."""
+        self.system_prompt = Path(self.system_prompt_path).read_text(encoding="utf-8")
+        self.rag_prompt = Path(self.rag_prompt_path).read_text(encoding="utf-8")
+        # Static head of every user prompt, built once per prompt load.
+        self._prompt_prefix = f"{self.rag_prompt}\nContext:\n"
 
-    def _retrieve(self, query: str) -> List[Tuple[str, float, dict]]:
-        query_vec = self.embedder.embed_query(query)
-        return self.store.search(
-            query_vec, top_k=self.top_k, score_threshold=self.similarity_threshold
-        )
+    # ── internal helpers ────────────────────────────────
 
-    def _build_user_prompt(self, query: str, contexts: List[str]) -> str:
-        context_block = "\n---\n".join(contexts)
+    def _cache_key(self, query: str) -> Hashable:
         return (
-            f"{self.rag_prompt}\n"
-            f"Context:\n{context_block}\n\n"
-            f"User question: {query}\n"
-            "Answer concisely using only the context."
+            " ".join(query.lower().split()),
+            self.top_k,
+            self.similarity_threshold,
+            getattr(self.store, "generation", 0),
         )
 
-    # ── public API ──────────────────────────────────────
+    def _cached_hits(self, key: Hashable) -> Optional[List[Tuple[str, float, dict]]]:
+        with self._hits_lock:
+            hits = self._hits_cache.get(key)
+            if hits is not None:
+                self._hits_cache.move_to_end(key)
+            return hits
 
-    def generate(self, query: str) -> Tuple[str, List[str]]:
-        """Run retrieval then generation.  Returns (answer, source_names)."""
-        hits = self._retrieve(query)
+    def _remember_hits(self, key: Hashable, hits: List[Tuple[str, float, dict]]) -> None:
+        if self._hits_cache_size <= 0:
+            return
+        with self._hits_lock:
+            self._hits_cache[key] = hits
+            self._hits_cache.move_to_end(key)
+            while len(self._hits_cache) > self._hits_cache_size:
+                self._hits_cache.popitem(last=False)
+
+    def _retrieve(self, query: str) -> List[Tuple[str, float, dict]]:
+        key = self._cache_key(query)
+        hits = self._cached_hits(key)
+        if hits is None:
+            query_vec = self.embedder.embed_query(query)
+            hits = self.store.search(
+                query_vec, top_k=self.top_k, score_threshold=self.similarity_threshold
+            )
+            self._remember_hits(key, hits)
+        return hits
+
+    def _retrieve_many(self, queries: List[str]) -> List[List[Tuple[str, float, dict]]]:
+        """Batched ``_retrieve``: only cache misses are embedded and searched."""
+        keys = [self._cache_key(q) for q in queries]
+        results = [self._cached_hits(k) for k in keys]
+        missing = [i for i, hits in enumerate(results) if hits is None]
+        if missing:
+            query_vecs = self.embedder.embed_queries([queries[i] for i in missing])
+            found = self.store.search_batch(
+                query_vecs, top_k=self.top_k, score_threshold=self.similarity_threshold
+            )
+            for i, hits in zip(missing, found):
+                results[i] = hits
+                self._remember_hits(keys[i], hits)
+        return results
+
+    async def _aretrieve(self, query: str) -> List[Tuple[str, float, dict]]:
+        hits = self._cached_hits(self._cache_key(query))
+        if hits is not None:
+            return hits
+        if self._searcher is None:
+            return await asyncio.to_thread(self._retrieve, query)
+        return await self._searcher.search(query)
+
+    def _answer(self, query: str, hits: List[Tuple[str, float, dict]]) -> Tuple[str, List[str]]:
         if not hits:
             return _REFUSAL, []
 
         contexts = [h[0] for h in hits]
-        sources = list({h[2].get("document_name", "unknown") for h in hits})
+        sources = _sources(hits)
         user_prompt = self._build_user_prompt(query, contexts)
         answer = self.llm.generate(user_prompt, system_prompt=self.system_prompt)
         return answer, sources
 
+    async def _aanswer(
+        self, query: str, hits: List[Tuple[str, float, dict]]
+    ) -> Tuple[str, List[str]]:
+        if not hits:
+            return _REFUSAL, []
+
+        sources = _sources(hits)
+        user_prompt = self._build_user_prompt(query, [h[0] for h in hits])
+        answer = await self.llm.agenerate(user_prompt, system_prompt=self.system_prompt)
+        return answer, sources
+
+    def _build_user_prompt(self, query: str, contexts: List[str]) -> str:
+        return "".join((
+            self._prompt_prefix,
+            "\n---\n".join(_clip(c, self.max_context_chars) for c in contexts),
+            "\n\nUser question: ",
+            query,
+            _PROMPT_SUFFIX,
+        ))
+
+    # ── public API ──────────────────────────────────────
+
+    def generate(self, query: str) -> Tuple[str, List[str]]:
+        """Run retrieval then generation.  Returns (answer, source_names)."""
+        return self._answer(query, self._retrieve(query))
+
+    async def agenerate(self, query: str) -> Tuple[str, List[str]]:
+        """Async ``generate()``.
+
+        Concurrent calls share one batched embed + search; their LLM requests
+        then run side by side, so a server that batches parallel requests
+        (e.g. Ollama with ``OLLAMA_NUM_PARALLEL``) serves them together.
+        """
+        return await self._aanswer(query, await self._aretrieve(query))
+
+    def generate_batch(
+        self, queries: List[str], max_workers: int = 4
+    ) -> List[Tuple[str, List[str]]]:
+        """Answer several queries, in order.
+
+        All queries are embedded in one batch and searched with one batched
+        store call; the LLM requests then run concurrently.
+        """
+        if not queries:
+            return []
+        hits_per_query = self._retrieve_many(queries)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as pool:
+            return list(pool.map(self._answer, queries, hits_per_query))
+
+    def _stream_preamble(self, hits: List[Tuple[str, float, dict]]) -> List[Tuple[str, Any]]:
+        """The ``sources`` and ``contexts`` events that open a stream."""
+        sources = _sources(hits)
+
+        # Build source context snippets for hover previews
+        source_contexts = []
+        for text, score, meta in hits:
+            source_contexts.append({
+                "document": meta.get("document_name", "unknown"),
+                "chunk_id": meta.get("chunk_id", ""),
+                "text": text[:500],
+                "score": round(score, 3),
+            })
+
+        return [("sources", sources), ("contexts", source_contexts)]
+
     def generate_stream(self, query: str):
         """Run retrieval then stream generation tokens.
 
@@ -85,24 +236,36 @@ class RAGPipeline:
             yield ("done", "")
             return
 
-        contexts = [h[0] for h in hits]
-        sources = list({h[2].get("document_name", "unknown") for h in hits})
+        yield from self._stream_preamble(hits)
 
-        # Build source context snippets for hover previews
-        source_contexts = []
-        for text, score, meta in hits:
-            source_contexts.append({
-                "document": meta.get("document_name", "unknown"),
-                "chunk_id": meta.get("chunk_id", ""),
-                "text": text[:500],
-                "score": round(score, 3),
-            })
+        user_prompt = self._build_user_prompt(query, [h[0] for h in hits])
+        for chunk in self.llm.generate_stream(
+            user_prompt, system_prompt=self.system_prompt
+        ):
+            yield ("token", chunk)
 
-        yield ("sources", sources)
-        yield ("contexts", source_contexts)
+        yield ("done", "")
 
-        user_prompt = self._build_user_prompt(query, contexts)
-        for chunk in self.llm.generate_stream(
+    async def agenerate_stream(self, query: str) -> AsyncIterator[Tuple[str, Any]]:
+        """Async ``generate_stream()`` with the same events.
+
+        Retrieval (embedding + search) runs in a worker thread, batched with
+        any other streams starting at the same moment; tokens come from the
+        LLM client's async stream, so no thread is held while the model
+        generates.
+        """
+        hits = await self._aretrieve(query)
+        if not hits:
+            yield ("sources", [])
+            yield ("token", _REFUSAL)
+            yield ("done", "")
+            return
+
+        for event in self._stream_preamble(hits):
+            yield event
+
+        user_prompt = self._build_user_prompt(query, [h[0] for h in hits])
+        async for chunk in self.llm.agenerate_stream(
             user_prompt, system_prompt=self.system_prompt
         ):
             yield ("token", chunk)
@@ -2,17 +2,23 @@
 
 from __future__ import annotations
 
-import json
 import logging
 import os
+import sys
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Union
 
 import numpy as np
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Embeddings arrive as float32 ndarrays from EmbeddingService; plain lists
+# are still accepted.
+Vector = Union[np.ndarray, Sequence[float]]
+Vectors = Union[np.ndarray, Sequence[Sequence[float]]]
+
 try:
     import faiss  # type: ignore[import-untyped]
 except ImportError:
@@ -23,18 +29,21 @@ except ImportError:
 
 
 class VectorStore(ABC):
+    # Bumped by every ``add_texts``; lets callers invalidate cached results.
+    generation: int = 0
+
     @abstractmethod
     def add_texts(
         self,
         texts: List[str],
-        embeddings: List[List[float]],
+        embeddings: Vectors,
         metadatas: List[Dict[str, Any]],
     ) -> None: ...
 
     @abstractmethod
     def search(
         self,
-        query_embedding: List[float],
+        query_embedding: Vector,
         top_k: int,
         score_threshold: float,
     ) -> List[Tuple[str, float, Dict[str, Any]]]: ...
@@ -42,76 +51,319 @@ class VectorStore(ABC):
     @abstractmethod
     def save(self) -> None: ...
 
+    def search_batch(
+        self,
+        query_embeddings: Vectors,
+        top_k: int,
+        score_threshold: float,
+    ) -> List[List[Tuple[str, float, Dict[str, Any]]]]:
+        """Search for several queries at once.  Default runs them one by one."""
+        return [self.search(q, top_k, score_threshold) for q in query_embeddings]
+
 
 # ── FAISS ───────────────────────────────────────────────
 
 
+_MISSING = object()
+
+
+class _ChunkMetadata:
+    """Per-chunk metadata stored column-wise.
+
+    The usual ingest fields each live in their own list, so a chunk costs a
+    few list slots instead of a dict, and repeated document fields and tag
+    lists are shared between chunks.  Any other keys go to a per-chunk
+    ``extra`` dict (``None`` when there are none).  :meth:`row` rebuilds the
+    original dict.
+    """
+
+    columns = ("id", "document_name", "source_path", "version", "tags", "text")
+    _interned = frozenset({"document_name", "source_path", "version"})
+
+    def __init__(self) -> None:
+        self._cols: Dict[str, List[Any]] = {key: [] for key in self.columns}
+        self._extra: List[Dict[str, Any] | None] = []
+        self._tag_lists: Dict[Tuple[str, ...], List[str]] = {}
+        self.texts = self._cols["text"]
+
+    def __len__(self) -> int:
+        return len(self._extra)
+
+    def extend(self, metadatas: List[Dict[str, Any]]) -> None:
+        for meta in metadatas:
+            for key, column in self._cols.items():
+                value = meta.get(key, _MISSING)
+                if key in self._interned and isinstance(value, str):
+                    value = sys.intern(value)
+                elif key == "tags" and isinstance(value, list) and all(isinstance(t, str) for t in value):
+                    tags = tuple(value)
+                    value = self._tag_lists.setdefault(tags, [sys.intern(t) for t in tags])
+                column.append(value)
+            extra = {k: v for k, v in meta.items() if k not in self._cols}
+            self._extra.append(extra or None)
+
+    def text(self, i: int) -> str:
+        value = self.texts[i]
+        return "" if value is _MISSING else value
+
+    def row(self, i: int) -> Dict[str, Any]:
+        meta = {key: column[i] for key, column in self._cols.items() if column[i] is not _MISSING}
+        if self._extra[i]:
+            meta.update(self._extra[i])
+        return meta
+
+    def rows(self, start: int = 0):
+        return (self.row(i) for i in range(start, len(self)))
+
+
+def _jsonl(metadata: Iterable[Dict[str, Any]]):
+    return (orjson.dumps(meta, option=orjson.OPT_APPEND_NEWLINE) for meta in metadata)
+
+
+def _is_json_array(path: Path) -> bool:
+    with open(path, "rb") as fh:
+        return fh.read(64).lstrip().startswith(b"[")
+
+
+def _committed_size(fh) -> int:
+    """Size of *fh* up to and including its last newline."""
+    end = fh.seek(0, os.SEEK_END)
+    pos = end
+    while pos > 0:
+        step = min(pos, 1 << 16)
+        fh.seek(pos - step)
+        block = fh.read(step)
+        nl = block.rfind(b"\n")
+        if nl != -1:
+            return pos - step + nl + 1
+        pos -= step
+    return 0
+
+
+def load_metadata_file(path: str | Path) -> List[Dict[str, Any]]:
+    """Read FAISS chunk metadata: one JSON object per line.
+
+    Files written before the JSONL layout hold a single JSON array and are
+    still accepted.  A torn last line (a save interrupted mid-append) ends
+    the list.
+    """
+    data = Path(path).read_bytes()
+    if data.lstrip().startswith(b"["):
+        return orjson.loads(data)
+    metadata: List[Dict[str, Any]] = []
+    for line in data.splitlines():
+        if not line:
+            continue
+        try:
+            metadata.append(orjson.loads(line))
+        except orjson.JSONDecodeError:
+            break
+    return metadata
+
+
+def count_metadata_file(path: str | Path) -> int:
+    """Count the entries :func:`load_metadata_file` would return.
+
+    JSONL files are counted by newlines in fixed-size blocks, without
+    parsing any line; a torn last line has no newline, so it is not counted.
+    """
+    if _is_json_array(Path(path)):
+        return len(orjson.loads(Path(path).read_bytes()))
+    count = 0
+    with open(path, "rb") as fh:
+        while block := fh.read(1 << 20):
+            count += block.count(b"\n")
+    return count
+
+
+def set_faiss_threads(threads: int = 0) -> None:
+    """Set FAISS's OpenMP thread count (0 = every core).
+
+    Containers often export ``OMP_NUM_THREADS=1``, which would leave the
+    flat inner-product scan on a single core.  Query embedding and search
+    run one after the other, so sharing the cores with the encoder's
+    threads does not oversubscribe them.
+    """
+    if faiss is not None:
+        faiss.omp_set_num_threads(threads or os.cpu_count() or 1)
+
+
+# HNSW graph parameters: M links per node, build-time and query-time beam widths.
+_HNSW_M = 32
+_HNSW_EF_CONSTRUCTION = 200
+_HNSW_EF_SEARCH = 64
+
+
+def _train_unit_range(index) -> None:
+    """Train a scalar quantizer on the fixed [-1, 1] range of unit vectors.
+
+    Normalized embeddings never leave that range, so the quantizer does not
+    depend on whichever batch happens to be added first.
+    """
+    bounds = np.ones((2, index.d), dtype=np.float32)
+    bounds[0] = -1.0
+    index.train(bounds)
+
+
+def _new_faiss_index(dim: int, index_type: str):
+    """Create an empty inner-product index of the requested type."""
+    if index_type == "flat":
+        return faiss.IndexFlatIP(dim)
+    if index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, _HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = _HNSW_EF_CONSTRUCTION
+        return index
+    if index_type == "sq8":
+        # One byte per dimension instead of four.
+        index = faiss.IndexScalarQuantizer(
+            dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+        )
+        _train_unit_range(index)
+        return index
+    raise ValueError(f"Unsupported FAISS index type: {index_type}")
+
+
 class FaissVectorStore(VectorStore):
-    """Lightweight FAISS wrapper with JSON metadata persistence."""
+    """Lightweight FAISS wrapper with JSON-lines metadata persistence.
 
-    def __init__(self, dim: int, index_path: str, metadata_path: str) -> None:
+    :meth:`save` appends only the chunks added since the last save to the
+    metadata file, so its cost grows with the new chunks, not the corpus.
+
+    ``index_type`` picks the index built for a new store: ``"flat"`` (exact,
+    linear scan — fine for small corpora), ``"hnsw"`` (approximate graph
+    search, sublinear in the number of chunks) or ``"sq8"`` (exact scan over
+    int8-quantized vectors: a quarter of the memory, scores within about
+    1% of flat).  A saved index keeps the type it was built with until it is
+    cleared or rebuilt.
+    """
+
+    def __init__(
+        self, dim: int, index_path: str, metadata_path: str, index_type: str = "flat"
+    ) -> None:
         if faiss is None:
             raise ImportError("faiss-cpu is required for FaissVectorStore")
 
         self.dim = dim
         self.index_path = index_path
         self.metadata_path = metadata_path
-        self._metadata: List[Dict[str, Any]] = []
+        self._metadata = _ChunkMetadata()
+        # Entries already in the metadata file; None means rewrite it whole.
+        self._saved: int | None = 0
 
-        if Path(index_path).exists() and Path(metadata_path).exists():
+        meta_file = self._existing_metadata_file()
+        if Path(index_path).exists() and meta_file is not None:
             logger.info("Loading existing FAISS index from %s", index_path)
             self.index = faiss.read_index(index_path)
-            with open(metadata_path, "r", encoding="utf-8") as fh:
-                self._metadata = json.load(fh)
+            loaded = load_metadata_file(meta_file)
+            # Metadata is appended before the index is written, so after a
+            # crash it can run ahead of the index; drop the extra entries.
+            self._metadata.extend(loaded[: self.index.ntotal])
+            appendable = (
+                len(loaded) == len(self._metadata)
+                and meta_file == Path(metadata_path)
+                and not _is_json_array(meta_file)
+            )
+            self._saved = len(self._metadata) if appendable else None
         else:
-            logger.info("Initialising new FAISS index (dim=%s)", dim)
-            self.index = faiss.IndexFlatIP(dim)
+            logger.info("Initialising new FAISS index (dim=%s, type=%s)", dim, index_type)
+            self.index = _new_faiss_index(dim, index_type)
             Path(os.path.dirname(index_path) or ".").mkdir(parents=True, exist_ok=True)
             Path(os.path.dirname(metadata_path) or ".").mkdir(parents=True, exist_ok=True)
+            self._saved = None
+        if hasattr(self.index, "hnsw"):
+            self.index.hnsw.efSearch = _HNSW_EF_SEARCH
 
     def add_texts(
         self,
         texts: List[str],
-        embeddings: List[List[float]],
+        embeddings: Vectors,
         metadatas: List[Dict[str, Any]],
     ) -> None:
-        if not embeddings:
+        if len(embeddings) == 0:
             return
         if len(embeddings) != len(texts) or len(metadatas) != len(texts):
             raise ValueError("Length mismatch between texts, embeddings, and metadata")
-        vectors = np.array(embeddings).astype("float32")
+        # No copy when the embedder already produced a C-contiguous float32 array.
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if not self.index.is_trained:
+            # Empty sq8 indexes saved before they were trained up front.
+            _train_unit_range(self.index)
         self.index.add(vectors)
         self._metadata.extend(metadatas)
+        self.generation += 1
 
     def search(
         self,
-        query_embedding: List[float],
+        query_embedding: Vector,
         top_k: int,
         score_threshold: float,
     ) -> List[Tuple[str, float, Dict[str, Any]]]:
+        # A (1, dim) view of the embedder's array — no copy on the way to FAISS.
+        q = np.asarray(query_embedding, dtype=np.float32).reshape(1, -1)
+        return self.search_batch(q, top_k, score_threshold)[0]
+
+    def search_batch(
+        self,
+        query_embeddings: Vectors,
+        top_k: int,
+        score_threshold: float,
+    ) -> List[List[Tuple[str, float, Dict[str, Any]]]]:
+        """Search all queries with one ``index.search`` call on a (B, dim) matrix."""
         if self.index.ntotal == 0:
-            return []
-        q = np.array([query_embedding]).astype("float32")
+            return [[] for _ in query_embeddings]
+        q = np.ascontiguousarray(query_embeddings, dtype=np.float32)
         scores, ids = self.index.search(q, top_k)
-        results: List[Tuple[str, float, Dict[str, Any]]] = []
-        for score, idx in zip(scores[0], ids[0]):
-            if idx == -1 or score < score_threshold:
-                continue
-            meta = self._metadata[idx]
-            results.append((meta.get("text", ""), float(score), meta))
-        return results
+        # Filter missing ids and low scores with one mask over the whole batch.
+        keep = (ids != -1) & (scores >= score_threshold)
+        md = self._metadata
+        batch: List[List[Tuple[str, float, Dict[str, Any]]]] = []
+        for row_keep, row_scores, row_ids in zip(keep, scores, ids):
+            batch.append([
+                (md.text(i), score, md.row(i))
+                for i, score in zip(row_ids[row_keep].tolist(), row_scores[row_keep].tolist())
+            ])
+        return batch
+
+    def _existing_metadata_file(self) -> Path | None:
+        path = Path(self.metadata_path)
+        if path.exists():
+            return path
+        # Stores created before the JSONL layout used a sibling ``.json`` file.
+        legacy = path.with_suffix(".json")
+        if path.suffix == ".jsonl" and legacy.exists():
+            return legacy
+        return None
 
     def save(self) -> None:
+        path = Path(self.metadata_path)
+        if self._saved is None:
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_bytes(b"".join(_jsonl(self._metadata.rows())))
+            os.replace(tmp, path)
+            legacy = path.with_suffix(".json")
+            if path.suffix == ".jsonl" and legacy.exists():
+                legacy.unlink()
+        elif self._saved < len(self._metadata):
+            with open(path, "r+b") as fh:
+                # Drop a torn line left by an interrupted append.
+                fh.truncate(_committed_size(fh))
+                fh.seek(0, os.SEEK_END)
+                fh.write(b"".join(_jsonl(self._metadata.rows(self._saved))))
+        self._saved = len(self._metadata)
         faiss.write_index(self.index, self.index_path)
-        with open(self.metadata_path, "w", encoding="utf-8") as fh:
-            json.dump(self._metadata, fh, ensure_ascii=False, indent=2)
 
 
 # ── Qdrant ──────────────────────────────────────────────
 
 
 class QdrantVectorStore(VectorStore):
-    """Qdrant cloud / self-hosted implementation."""
+    """Qdrant cloud / self-hosted implementation.
+
+    Talks gRPC by default (``prefer_grpc``), which serializes large upserts
+    far more cheaply than the REST/JSON API.
+    """
+
+    upsert_batch_size = 1024
 
     def __init__(
         self,
@@ -119,11 +371,15 @@ class QdrantVectorStore(VectorStore):
         url: str,
         collection: str,
         api_key: str | None = None,
+        prefer_grpc: bool = True,
+        grpc_port: int = 6334,
     ) -> None:
         from qdrant_client import QdrantClient
         from qdrant_client.http import models as rest
 
-        self.client = QdrantClient(url=url, api_key=api_key)
+        self.client = QdrantClient(
+            url=url, api_key=api_key, prefer_grpc=prefer_grpc, grpc_port=grpc_port
+        )
         self.collection = collection
         self.rest = rest
 
@@ -137,32 +393,38 @@ class QdrantVectorStore(VectorStore):
     def add_texts(
         self,
         texts: List[str],
-        embeddings: List[List[float]],
+        embeddings: Vectors,
         metadatas: List[Dict[str, Any]],
     ) -> None:
-        if not embeddings:
+        if len(embeddings) == 0:
             return
         import uuid
 
-        points = []
-        for text, vec, meta in zip(texts, embeddings, metadatas):
-            payload = {**meta, "text": text}
-            points.append(
-                self.rest.PointStruct(
-                    id=str(uuid.uuid4()), vector=vec, payload=payload
-                )
+        # Random 64-bit integer ids are smaller on the wire than UUID strings.
+        vectors = np.asarray(embeddings, dtype=np.float32).tolist()
+        payloads = [{**meta, "text": text} for text, meta in zip(texts, metadatas)]
+        ids = [uuid.uuid4().int & ((1 << 64) - 1) for _ in payloads]
+        step = self.upsert_batch_size
+        for start in range(0, len(ids), step):
+            self.client.upsert(
+                collection_name=self.collection,
+                points=self.rest.Batch(
+                    ids=ids[start:start + step],
+                    vectors=vectors[start:start + step],
+                    payloads=payloads[start:start + step],
+                ),
             )
-        self.client.upsert(collection_name=self.collection, points=points)
+        self.generation += 1
 
     def search(
         self,
-        query_embedding: List[float],
+        query_embedding: Vector,
         top_k: int,
         score_threshold: float,
     ) -> List[Tuple[str, float, Dict[str, Any]]]:
         hits = self.client.search(
             collection_name=self.collection,
-            query_vector=query_embedding,
+            query_vector=np.asarray(query_embedding, dtype=np.float32).tolist(),
             limit=top_k,
             score_threshold=score_threshold,
             with_payload=True,
@@ -188,14 +450,29 @@ def create_vector_store(
     qdrant_url: str | None = None,
     qdrant_api_key: str | None = None,
     qdrant_collection: str = "nexa_support",
+    qdrant_prefer_grpc: bool = True,
+    qdrant_grpc_port: int = 6334,
+    faiss_index_type: str = "flat",
+    faiss_threads: int = 0,
 ) -> VectorStore:
     kind_lower = kind.lower()
     if kind_lower == "faiss":
-        return FaissVectorStore(dim=dim, index_path=index_path, metadata_path=metadata_path)
+        set_faiss_threads(faiss_threads)
+        return FaissVectorStore(
+            dim=dim,
+            index_path=index_path,
+            metadata_path=metadata_path,
+            index_type=faiss_index_type.lower(),
+        )
     if kind_lower == "qdrant":
         if not qdrant_url:
             raise ValueError("QDRANT_URL must be set when VECTOR_STORE=qdrant")
         return QdrantVectorStore(
-            dim=dim, url=qdrant_url, collection=qdrant_collection, api_key=qdrant_api_key
+            dim=dim,
+            url=qdrant_url,
+            collection=qdrant_collection,
+            api_key=qdrant_api_key,
+            prefer_grpc=qdrant_prefer_grpc,
+            grpc_port=qdrant_grpc_port,
         )
     raise ValueError(f"Unsupported vector store: {kind}")
@@ -2,26 +2,38 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import hashlib
 import json
 import logging
 import os
+import shutil
 import uuid
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import AsyncContextManager, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, File, Form, HTTPException, UploadFile
-from fastapi.responses import StreamingResponse
+import orjson
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel
 
 from app.controllers.chat_controller import ChatController
 from app.controllers.health_controller import HealthController
 from app.controllers.ingest_controller import IngestController
 from app.dependencies import (
-    _cache,
+    get_http_client,
     get_ingestion_service,
     get_llm_client,
     get_rag_pipeline,
     get_settings,
     get_vector_store,
+    reset_llm,
+    reset_store,
+    settings_revision,
+    update_settings,
 )
 from app.models.schemas import (
     ApiKeysResponse,
@@ -29,6 +41,8 @@ from app.models.schemas import (
     ApiProfile,
     ApiProfileListResponse,
     ApiProfileSummary,
+    ChatBatchRequest,
+    ChatBatchResponse,
     ChatRequest,
     ChatResponse,
     CloudModelEntry,
@@ -59,53 +73,175 @@ from app.models.schemas import (
     UploadedFilesListResponse,
 )
 from app.services.history import HistoryService
+from app.services.llm.cloud_client import CloudLLMClient
+from app.services.llm.ollama_client import OllamaClient
+from app.views.orjson_response import ORJSONResponse
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api", tags=["api"])
+router = APIRouter(prefix="/api", tags=["api"], default_response_class=ORJSONResponse)
+
+
+def _model_response(model: BaseModel) -> Response:
+    """Serialize *model* in pydantic-core, skipping ``jsonable_encoder``.
+
+    Used by list-heavy GET endpoints, declared with ``response_model=None``
+    and ``responses`` so the schema still appears in the OpenAPI docs.
+    """
+    return Response(model.model_dump_json(), media_type="application/json")
+
+
+# Caps chat and ingest work in flight (``llm_concurrency``); requests over
+# the cap wait here instead of piling onto the LLM and the worker threads.
+# Holds (settings revision, limit, semaphore); a new limit gets a new
+# semaphore, and requests already holding a slot of the old one finish there.
+_work_slots: Optional[Tuple[int, int, asyncio.Semaphore]] = None
+
+
+def _work_slot() -> AsyncContextManager:
+    global _work_slots
+    revision = settings_revision()
+    if _work_slots is None or _work_slots[0] != revision:
+        limit = get_settings().llm_concurrency
+        if _work_slots is None or _work_slots[1] != limit:
+            _work_slots = (revision, limit, asyncio.Semaphore(max(limit, 1)))
+        else:
+            _work_slots = (revision, limit, _work_slots[2])
+    if _work_slots[1] <= 0:
+        return contextlib.nullcontext()
+    return _work_slots[2]
+
+
+# Controllers are stateless wrappers, so keep one per service instance
+# instead of building one per request.  Keying on the service means a
+# rebuilt client/pipeline (model switch, index rebuild) gets a fresh one.
+_health_controller = lru_cache(maxsize=1)(HealthController)
+_chat_controller = lru_cache(maxsize=1)(ChatController)
+_ingest_controller = lru_cache(maxsize=1)(IngestController)
+
+
+def health_controller(llm=Depends(get_llm_client)) -> HealthController:
+    return _health_controller(llm)
+
+
+def chat_controller(pipeline=Depends(get_rag_pipeline)) -> ChatController:
+    return _chat_controller(pipeline)
+
+
+def ingest_controller(service=Depends(get_ingestion_service)) -> IngestController:
+    return _ingest_controller(service)
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _conditional_response(request: Request, body: bytes, etag: str) -> Response:
+    """JSON *body* tagged with *etag*; 304 when the client already has it.
+
+    ``no-cache`` makes clients revalidate every time, since these views can
+    change at runtime, but an unchanged body is never re-sent.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in (tag.strip() for tag in request.headers.get("if-none-match", "").split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
 
 
 @router.get("/health", response_model=HealthResponse)
-def health():
-    controller = HealthController(get_llm_client())
-    return controller.check_health()
+async def health(controller: HealthController = Depends(health_controller)):
+    return await controller.acheck_health()
 
 
-@router.post("/chat", response_model=ChatResponse)
-def chat(req: ChatRequest):
-    controller = ChatController(get_rag_pipeline())
+# The response is built from validated values, so skip FastAPI's second
+# validation pass; ``responses`` keeps the schema in the OpenAPI docs.
+@router.post("/chat", response_model=None, responses={200: {"model": ChatResponse}})
+async def chat(req: ChatRequest, controller: ChatController = Depends(chat_controller)):
     try:
-        answer, sources = controller.handle_chat(req.message)
+        async with _work_slot():
+            answer, sources = await controller.ahandle_chat(req.message)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
-    return ChatResponse(answer=answer, sources=sources)
+    return ORJSONResponse(ChatResponse(answer=answer, sources=sources).model_dump())
+
+
+@router.post("/chat/batch", response_model=ChatBatchResponse)
+async def chat_batch(req: ChatBatchRequest, controller: ChatController = Depends(chat_controller)):
+    """Answer several questions with one batched retrieval pass."""
+    try:
+        async with _work_slot():
+            results = await asyncio.to_thread(
+                controller.handle_chat_batch, [m.message for m in req.messages]
+            )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return ChatBatchResponse(
+        results=[ChatResponse(answer=answer, sources=sources) for answer, sources in results]
+    )
+
+
+# Pre-encoded SSE frame prefixes; each token is serialized once by orjson
+# and framed by bytes concatenation.
+_SSE_EVENTS = {
+    kind: f"event: {kind}\ndata: ".encode()
+    for kind in ("sources", "contexts", "token")
+}
+_SSE_END = b"\n\n"
+_SSE_DONE = b'event: done\ndata: ""' + _SSE_END
+
+
+async def _coalesce(frames: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Yield *frames*, merging those that pile up while a send is in progress.
+
+    A background task pulls frames as soon as they are produced; each time
+    the response is ready for more it gets everything queued so far in one
+    body message.  A lone token is never held back waiting for company.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def pump() -> None:
+        try:
+            async for frame in frames:
+                queue.put_nowait(frame)
+        finally:
+            queue.put_nowait(None)
+
+    task = asyncio.create_task(pump())
+    try:
+        done = False
+        while not done:
+            parts = [await queue.get()]
+            while not queue.empty():
+                parts.append(queue.get_nowait())
+            if parts[-1] is None:  # pump finished; the sentinel is always last
+                parts.pop()
+                done = True
+            if parts:
+                yield b"".join(parts)
+        await task  # surface an error raised by *frames*
+    finally:
+        task.cancel()  # no-op once finished; stops generation if the client left
 
 
 @router.post("/chat/stream")
-def chat_stream(req: ChatRequest):
+def chat_stream(req: ChatRequest, controller: ChatController = Depends(chat_controller)):
     """Server-Sent Events stream for chat — tokens arrive incrementally."""
-    cleaned = req.message.strip()
-    if not cleaned:
+    if not req.message.strip():
         raise HTTPException(status_code=400, detail="Message cannot be empty")
 
-    pipeline = get_rag_pipeline()
-
-    def event_generator():
+    async def event_generator():
         try:
-            for kind, payload in pipeline.generate_stream(cleaned):
-                if kind == "sources":
-                    yield f"event: sources\ndata: {json.dumps(payload)}\n\n"
-                elif kind == "contexts":
-                    yield f"event: contexts\ndata: {json.dumps(payload)}\n\n"
-                elif kind == "token":
-                    yield f"event: token\ndata: {json.dumps(payload)}\n\n"
-                elif kind == "done":
-                    yield f"event: done\ndata: \"\"\n\n"
+            async with _work_slot():
+                async for kind, payload in controller.handle_chat_stream(req.message):
+                    if kind == "done":
+                        yield _SSE_DONE
+                    elif kind in _SSE_EVENTS:
+                        yield _SSE_EVENTS[kind] + orjson.dumps(payload) + _SSE_END
         except Exception as exc:
             logger.error("Stream error: %s", exc, exc_info=True)
-            yield f"event: error\ndata: {json.dumps(str(exc))}\n\n"
+            yield b"event: error\ndata: " + orjson.dumps(str(exc)) + _SSE_END
 
     return StreamingResponse(
-        event_generator(),
+        _coalesce(event_generator()),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -116,16 +252,52 @@ def chat_stream(req: ChatRequest):
 
 
 @router.post("/ingest", response_model=IngestResponse)
-def ingest(req: IngestRequest):
-    controller = IngestController(get_ingestion_service())
+async def ingest(req: IngestRequest, controller: IngestController = Depends(ingest_controller)):
     try:
-        count = controller.ingest(req.paths, tags=req.tags, version=req.version)
+        async with _work_slot():
+            count = await asyncio.to_thread(
+                controller.ingest, req.paths, tags=req.tags, version=req.version
+            )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
     return IngestResponse(chunks_indexed=count)
 
 
 UPLOAD_DIR = Path("data/uploads")
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+MAX_FILE_SIZE = 50 * 1024 * 1024  # 50 MB
+ALLOWED_EXTENSIONS = frozenset({
+    ".pdf", ".txt", ".md", ".doc", ".docx",
+    ".html", ".htm", ".json", ".xml", ".csv", ".rst",
+})
+
+
+def _file_too_large(f: UploadFile) -> HTTPException:
+    return HTTPException(status_code=400, detail=f"File too large (max 50 MB): {f.filename}")
+
+
+def _copy_upload(upload: UploadFile, dest: Path) -> int:
+    """Copy an upload of known size into *dest*; return the bytes written.
+
+    A spool that has rolled over to a temp file is copied in the kernel
+    with ``os.sendfile``; one still in memory goes through ``copyfileobj``.
+    """
+    src = upload.file
+    src.seek(0)
+    with dest.open("wb") as out:
+        # Same check Starlette's UploadFile uses to tell the two apart
+        if getattr(src, "_rolled", True) and hasattr(os, "sendfile"):
+            try:
+                offset = 0
+                while sent := os.sendfile(out.fileno(), src.fileno(), offset, 1 << 30):
+                    offset += sent
+                return offset
+            except OSError:  # no fileno, or sendfile cannot target files here
+                out.seek(0)
+                out.truncate()
+                src.seek(0)
+        shutil.copyfileobj(src, out, UPLOAD_CHUNK_SIZE)
+        return out.tell()
 
 
 @router.post("/upload", response_model=UploadResponse)
@@ -133,19 +305,16 @@ async def upload_documents(
     files: List[UploadFile] = File(...),
     tags: Optional[str] = Form(None),
     version: Optional[str] = Form(None),
+    controller: IngestController = Depends(ingest_controller),
 ):
     """Upload files, save to disk, and auto-ingest into the vector store."""
     UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
-    ALLOWED_EXTENSIONS = {
-        ".pdf", ".txt", ".md", ".doc", ".docx",
-        ".html", ".htm", ".json", ".xml", ".csv", ".rst",
-    }
-    MAX_FILE_SIZE = 50 * 1024 * 1024  # 50 MB
-
     saved_paths: List[str] = []
     file_infos: List[UploadedFileInfo] = []
 
+    # Validate every file before writing any, so a bad file in the batch
+    # leaves nothing behind.  The multipart parser records each file's size.
     for f in files:
         ext = Path(f.filename or "").suffix.lower()
         if ext not in ALLOWED_EXTENSIONS:
@@ -153,25 +322,46 @@ async def upload_documents(
                 status_code=400,
                 detail=f"Unsupported file type: {ext} ({f.filename})",
             )
+        if f.size is not None and f.size > MAX_FILE_SIZE:
+            raise _file_too_large(f)
 
-        content = await f.read()
-        if len(content) > MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File too large (max 50 MB): {f.filename}",
-            )
-
-        # Use unique filename to avoid collisions
-        safe_name = f"{uuid.uuid4().hex[:8]}_{Path(f.filename).name}"
-        dest = UPLOAD_DIR / safe_name
-        dest.write_bytes(content)
-        saved_paths.append(str(dest))
-        file_infos.append(UploadedFileInfo(
-            original_name=f.filename or "unknown",
-            saved_path=str(dest),
-            size=len(content),
-        ))
-        logger.info("Uploaded file: %s → %s (%d bytes)", f.filename, dest, len(content))
+    # One urandom call gives every file its 4-byte collision-avoiding tag
+    name_tags = os.urandom(4 * len(files)).hex()
+    try:
+        for i, f in enumerate(files):
+            # Use unique filename to avoid collisions
+            safe_name = f"{name_tags[8 * i:8 * i + 8]}_{Path(f.filename).name}"
+            dest = UPLOAD_DIR / safe_name
+
+            if f.size is not None:
+                size = await asyncio.to_thread(_copy_upload, f, dest)
+            else:
+                # Copy in fixed-size chunks so memory stays flat regardless
+                # of file size, stopping once it is over the limit.
+                size = 0
+                with dest.open("wb") as out:
+                    while chunk := await f.read(UPLOAD_CHUNK_SIZE):
+                        size += len(chunk)
+                        if size > MAX_FILE_SIZE:
+                            break
+                        out.write(chunk)
+            _scan_uploads.cache_clear()  # a listing may have caught the file half-written
+            if size > MAX_FILE_SIZE:
+                dest.unlink(missing_ok=True)
+                raise _file_too_large(f)
+
+            saved_paths.append(str(dest))
+            file_infos.append(UploadedFileInfo(
+                original_name=f.filename or "unknown",
+                saved_path=str(dest),
+                size=size,
+            ))
+            logger.info("Uploaded file: %s → %s (%d bytes)", f.filename, dest, size)
+    except HTTPException:
+        for path in saved_paths:
+            Path(path).unlink(missing_ok=True)
+        _scan_uploads.cache_clear()
+        raise
 
     # Auto-ingest saved files
     tag_list = (
@@ -179,9 +369,12 @@ async def upload_documents(
     )
     ver = version.strip() if version and version.strip() else None
 
-    controller = IngestController(get_ingestion_service())
     try:
-        chunks = controller.ingest(saved_paths, tags=tag_list, version=ver)
+        # Loading, embedding and indexing block; keep them off the event loop
+        async with _work_slot():
+            chunks = await asyncio.to_thread(
+                controller.ingest, saved_paths, tags=tag_list, version=ver
+            )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
@@ -191,8 +384,25 @@ async def upload_documents(
     )
 
 
-@router.get("/config", response_model=ConfigResponse)
-def config():
+# Serialized settings views, keyed by name; each entry records the
+# settings revision it was built from and is rebuilt once that changes.
+_settings_views: Dict[str, Tuple[int, bytes, str]] = {}
+
+
+def _settings_view(
+    name: str, build: Callable[[], BaseModel], request: Optional[Request] = None
+) -> Response:
+    revision = settings_revision()
+    cached = _settings_views.get(name)
+    if cached is None or cached[0] != revision:
+        body = build().model_dump_json().encode()
+        cached = _settings_views[name] = (revision, body, _etag(body))
+    if request is None:
+        return Response(cached[1], media_type="application/json")
+    return _conditional_response(request, cached[1], cached[2])
+
+
+def _config_view() -> ConfigResponse:
     settings = get_settings()
     model_name = (
         settings.ollama_model
@@ -207,26 +417,34 @@ def config():
     )
 
 
+@router.get("/config", response_model=None, responses={200: {"model": ConfigResponse}})
+def config(request: Request):
+    return _settings_view("config", _config_view, request)
+
+
 # ── Ollama-specific endpoints ───────────────────────────
 
 
-@router.get("/ollama/models", response_model=OllamaModelsResponse)
-def ollama_models():
-    """List models available on the Ollama server."""
-    settings = get_settings()
-    if settings.llm_provider != "ollama":
+def ollama_client(client=Depends(get_llm_client)) -> OllamaClient:
+    """The active LLM client, provided the Ollama backend is selected.
+
+    The provider can be switched at runtime, so this is checked per request
+    rather than by registering the routes conditionally.
+    """
+    if get_settings().llm_provider != "ollama":
         raise HTTPException(
             status_code=400,
             detail="Ollama endpoints are only available when llm_provider is 'ollama'.",
         )
-
-    from app.services.llm.ollama_client import OllamaClient
-
-    client = get_llm_client()
     if not isinstance(client, OllamaClient):
         raise HTTPException(status_code=500, detail="LLM client is not an OllamaClient")
+    return client
 
-    raw_models = client.list_models()
+
+@router.get("/ollama/models", response_model=None, responses={200: {"model": OllamaModelsResponse}})
+async def ollama_models(request: Request, client: OllamaClient = Depends(ollama_client)):
+    """List models available on the Ollama server."""
+    raw_models = await asyncio.to_thread(client.list_models)
     entries = [
         OllamaModelEntry(
             name=m.get("name", "unknown"),
@@ -236,51 +454,29 @@ def ollama_models():
         )
         for m in raw_models
     ]
-    return OllamaModelsResponse(models=entries)
+    body = OllamaModelsResponse(models=entries).model_dump_json().encode()
+    return _conditional_response(request, body, _etag(body))
 
 
 @router.get("/ollama/status", response_model=OllamaStatusResponse)
-def ollama_status():
+async def ollama_status(client: OllamaClient = Depends(ollama_client)):
     """Check whether Ollama is running and report basic info."""
-    settings = get_settings()
-    if settings.llm_provider != "ollama":
-        raise HTTPException(
-            status_code=400,
-            detail="Ollama endpoints are only available when llm_provider is 'ollama'.",
-        )
-
-    from app.services.llm.ollama_client import OllamaClient
-
-    client = get_llm_client()
-    if not isinstance(client, OllamaClient):
-        raise HTTPException(status_code=500, detail="LLM client is not an OllamaClient")
-
-    running = client.health_check()
-    models = client.list_models() if running else []
+    # A non-empty model list proves the server is up; list_models returns
+    # [] when unreachable, so only then is a separate ping needed to tell
+    # "down" from "no models pulled yet".
+    models = await asyncio.to_thread(client.list_models)
+    running = bool(models) or await asyncio.to_thread(client.health_check)
     return OllamaStatusResponse(
         running=running,
         base_url=client.base_url,
-        model=client.model,
+        model=await client.aresolve_model(),
         models_available=len(models),
     )
 
 
 @router.put("/ollama/model", response_model=SwitchModelResponse)
-def switch_ollama_model(req: SwitchModelRequest):
+def switch_ollama_model(req: SwitchModelRequest, client: OllamaClient = Depends(ollama_client)):
     """Switch the active Ollama model at runtime."""
-    settings = get_settings()
-    if settings.llm_provider != "ollama":
-        raise HTTPException(
-            status_code=400,
-            detail="Model switching is only available when llm_provider is 'ollama'.",
-        )
-
-    from app.services.llm.ollama_client import OllamaClient
-
-    client = get_llm_client()
-    if not isinstance(client, OllamaClient):
-        raise HTTPException(status_code=500, detail="LLM client is not an OllamaClient")
-
     previous = client.model
     client.model = req.model
     logger.info("Switched Ollama model: %s → %s", previous, req.model)
@@ -292,20 +488,20 @@ def switch_ollama_model(req: SwitchModelRequest):
 _history = HistoryService()
 
 
-@router.get("/sessions", response_model=SessionListResponse)
+@router.get("/sessions", response_model=None, responses={200: {"model": SessionListResponse}})
 def list_sessions():
     """List all saved chat sessions."""
     sessions = _history.list_sessions()
-    return SessionListResponse(sessions=sessions)
+    return _model_response(SessionListResponse(sessions=sessions))
 
 
-@router.get("/sessions/{session_id}", response_model=SessionDetail)
+@router.get("/sessions/{session_id}", response_model=None, responses={200: {"model": SessionDetail}})
 def get_session(session_id: str):
     """Get full session details including messages."""
     session = _history.get_session(session_id)
     if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
-    return session
+    return _model_response(session)
 
 
 @router.post("/sessions", response_model=SessionDetail)
@@ -320,76 +516,92 @@ def delete_session(session_id: str):
     deleted = _history.delete_session(session_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Session not found")
-    return {"deleted": True}
+    return ORJSONResponse({"deleted": True})
 
 
 @router.delete("/sessions")
 def clear_all_sessions():
     """Delete all chat sessions."""
-    sessions = _history.list_sessions()
-    count = 0
-    for s in sessions:
-        if _history.delete_session(s.id):
-            count += 1
-    return {"deleted": count}
+    return ORJSONResponse({"deleted": _history.delete_all()})
 
 
 # ── Prompts endpoints ────────────────────────────────────
 
 
-@router.get("/prompts", response_model=PromptsResponse)
-def get_prompts():
-    """Read current system and RAG addon prompts."""
-    settings = get_settings()
-    system_prompt = ""
-    rag_addon_prompt = ""
+def _read_prompt(path: str) -> str:
     try:
-        with open(settings.system_prompt_path, "r", encoding="utf-8") as f:
-            system_prompt = f.read()
+        return Path(path).read_text(encoding="utf-8")
     except FileNotFoundError:
-        pass
-    try:
-        with open(settings.rag_prompt_path, "r", encoding="utf-8") as f:
-            rag_addon_prompt = f.read()
-    except FileNotFoundError:
-        pass
-    return PromptsResponse(system_prompt=system_prompt, rag_addon_prompt=rag_addon_prompt)
+        return ""
 
 
-@router.put("/prompts", response_model=PromptsResponse)
-def update_prompts(req: PromptsUpdateRequest):
-    """Update system and/or RAG addon prompts."""
+def _read_prompts() -> PromptsResponse:
+    settings = get_settings()
+    return PromptsResponse(
+        system_prompt=_read_prompt(settings.system_prompt_path),
+        rag_addon_prompt=_read_prompt(settings.rag_prompt_path),
+    )
+
+
+def _write_prompts(req: PromptsUpdateRequest) -> PromptsResponse:
     settings = get_settings()
     if req.system_prompt is not None:
-        with open(settings.system_prompt_path, "w", encoding="utf-8") as f:
-            f.write(req.system_prompt)
+        Path(settings.system_prompt_path).write_text(req.system_prompt, encoding="utf-8")
         logger.info("Updated system prompt (%d chars)", len(req.system_prompt))
     if req.rag_addon_prompt is not None:
-        with open(settings.rag_prompt_path, "w", encoding="utf-8") as f:
-            f.write(req.rag_addon_prompt)
+        Path(settings.rag_prompt_path).write_text(req.rag_addon_prompt, encoding="utf-8")
         logger.info("Updated RAG addon prompt (%d chars)", len(req.rag_addon_prompt))
-    return get_prompts()
+    # Refresh the prompts held by an already-built pipeline; a pipeline
+    # built later reads the new files anyway.
+    if get_rag_pipeline.cache_info().currsize:
+        get_rag_pipeline().reload_prompts()
+    return _read_prompts()
+
+
+# Prompt files are read and written on a worker thread so disk latency
+# never holds the event loop.
+@router.get("/prompts", response_model=PromptsResponse)
+async def get_prompts():
+    """Read current system and RAG addon prompts."""
+    return await asyncio.to_thread(_read_prompts)
+
+
+@router.put("/prompts", response_model=PromptsResponse)
+async def update_prompts(req: PromptsUpdateRequest):
+    """Update system and/or RAG addon prompts."""
+    return await asyncio.to_thread(_write_prompts, req)
 
 
 # ── Uploaded files management ────────────────────────────
 
 
-@router.get("/uploads", response_model=UploadedFilesListResponse)
+@router.get("/uploads", response_model=None, responses={200: {"model": UploadedFilesListResponse}})
 def list_uploaded_files():
     """List all uploaded files in the uploads directory."""
     UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    entries = _scan_uploads(str(UPLOAD_DIR), UPLOAD_DIR.stat().st_mtime_ns)
+    return _model_response(UploadedFilesListResponse(files=list(entries)))
+
+
+@lru_cache(maxsize=1)
+def _scan_uploads(upload_dir: str, mtime_ns: int) -> Tuple[UploadedFileEntry, ...]:
+    """Snapshot the uploads directory, reused while its mtime is unchanged.
+
+    Writing into an existing file does not touch the directory mtime, so
+    upload and delete also clear the cache explicitly.
+    """
+    with os.scandir(upload_dir) as it:
+        files = sorted((e for e in it if e.is_file()), key=lambda e: e.name)
     entries = []
-    for p in sorted(UPLOAD_DIR.iterdir()):
-        if p.is_file():
-            stat = p.stat()
-            from datetime import datetime, timezone
-            entries.append(UploadedFileEntry(
-                name=p.name,
-                path=str(p),
-                size=stat.st_size,
-                modified_at=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).isoformat(),
-            ))
-    return UploadedFilesListResponse(files=entries)
+    for e in files:
+        stat = e.stat()
+        entries.append(UploadedFileEntry(
+            name=e.name,
+            path=e.path,
+            size=stat.st_size,
+            modified_at=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).isoformat(),
+        ))
+    return tuple(entries)
 
 
 @router.delete("/uploads/{filename}")
@@ -397,37 +609,53 @@ def delete_uploaded_file(filename: str):
     """Delete an uploaded file."""
     safe_name = Path(filename).name  # prevent path traversal
     target = UPLOAD_DIR / safe_name
-    if not target.exists():
+    try:
+        target.unlink()
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="File not found")
-    target.unlink()
+    _scan_uploads.cache_clear()
     logger.info("Deleted uploaded file: %s", target)
-    return {"deleted": True, "file": safe_name}
+    return ORJSONResponse({"deleted": True, "file": safe_name})
 
 
 # ── Index stats & rebuild ────────────────────────────────
 
 
-@router.get("/index/stats", response_model=IndexStatsResponse)
+# Index files are stat'ed and removed EAFP-style: one syscall each, and no
+# window between an existence check and the operation.
+def _file_size(path: str) -> int:
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _delete_index_files() -> List[str]:
+    settings = get_settings()
+    deleted_files = []
+    for path in (settings.index_path, settings.metadata_path):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            continue
+        deleted_files.append(str(Path(path)))
+    return deleted_files
+
+
+@router.get("/index/stats", response_model=None, responses={200: {"model": IndexStatsResponse}})
 def index_stats():
     """Return vector index statistics."""
     settings = get_settings()
-    index_size = 0
-    meta_size = 0
     total_vectors = 0
     total_metadata = 0
 
-    idx_path = Path(settings.index_path)
-    meta_path = Path(settings.metadata_path)
-
-    if idx_path.exists():
-        index_size = idx_path.stat().st_size
-    if meta_path.exists():
-        meta_size = meta_path.stat().st_size
+    index_size = _file_size(settings.index_path)
+    meta_size = _file_size(settings.metadata_path)
+    if meta_size:
         try:
-            import json as _json
-            with open(meta_path, "r", encoding="utf-8") as f:
-                meta = _json.load(f)
-                total_metadata = len(meta) if isinstance(meta, list) else 0
+            from app.services.rag.vector_store import count_metadata_file
+
+            total_metadata = count_metadata_file(settings.metadata_path)
         except Exception:
             pass
 
@@ -438,46 +666,32 @@ def index_stats():
     except Exception:
         pass
 
-    return IndexStatsResponse(
+    return _model_response(IndexStatsResponse(
         total_vectors=total_vectors,
         total_metadata=total_metadata,
         index_path=settings.index_path,
         metadata_path=settings.metadata_path,
         index_size_bytes=index_size,
         metadata_size_bytes=meta_size,
-    )
+    ))
 
 
 @router.post("/index/rebuild")
 def rebuild_index():
     """Clear and rebuild the vector index (deletes existing index files)."""
-    settings = get_settings()
-    idx_path = Path(settings.index_path)
-    meta_path = Path(settings.metadata_path)
-
-    deleted_files = []
-    if idx_path.exists():
-        idx_path.unlink()
-        deleted_files.append(str(idx_path))
-    if meta_path.exists():
-        meta_path.unlink()
-        deleted_files.append(str(meta_path))
+    deleted_files = _delete_index_files()
 
     # Clear cached vector store so it gets recreated
-    _cache.pop("store", None)
-    _cache.pop("pipeline", None)
-    _cache.pop("ingestion", None)
+    reset_store()
 
     logger.info("Index rebuilt (cleared files: %s)", deleted_files)
-    return {"rebuilt": True, "deleted_files": deleted_files}
+    return ORJSONResponse({"rebuilt": True, "deleted_files": deleted_files})
 
 
 # ── API Keys ─────────────────────────────────────────────
 
 
-@router.get("/settings/api-keys", response_model=ApiKeysResponse)
-def get_api_keys():
-    """Read current cloud API key configuration (key is never exposed)."""
+def _api_keys_view() -> ApiKeysResponse:
     settings = get_settings()
     return ApiKeysResponse(
         llm_provider=settings.llm_provider,
@@ -487,26 +701,22 @@ def get_api_keys():
     )
 
 
+@router.get("/settings/api-keys", response_model=None, responses={200: {"model": ApiKeysResponse}})
+def get_api_keys():
+    """Read current cloud API key configuration (key is never exposed)."""
+    return _settings_view("api-keys", _api_keys_view)
+
+
 @router.put("/settings/api-keys", response_model=ApiKeysResponse)
 def update_api_keys(req: ApiKeysUpdateRequest):
     """Update cloud API keys and provider at runtime."""
     settings = get_settings()
-    changed = False
-    if req.llm_provider is not None and req.llm_provider != settings.llm_provider:
-        settings.llm_provider = req.llm_provider
-        changed = True
-    if req.cloud_api_key is not None:
-        settings.cloud_api_key = req.cloud_api_key
-        changed = True
-    if req.cloud_base_url is not None:
-        settings.cloud_base_url = req.cloud_base_url
-        changed = True
-    if req.cloud_model is not None:
-        settings.cloud_model = req.cloud_model
-        changed = True
-    if changed:
-        _cache.pop("llm", None)
-        _cache.pop("pipeline", None)
+    changes = req.model_dump(exclude_none=True)
+    if changes.get("llm_provider") == settings.llm_provider:
+        del changes["llm_provider"]
+    if changes:
+        update_settings(**changes)
+        reset_llm()
         logger.info("Updated API keys: provider=%s", settings.llm_provider)
     return get_api_keys()
 
@@ -514,28 +724,17 @@ def update_api_keys(req: ApiKeysUpdateRequest):
 @router.post("/index/clear")
 def clear_index():
     """Completely clear the vector index and metadata files."""
-    settings = get_settings()
-    idx_path = Path(settings.index_path)
-    meta_path = Path(settings.metadata_path)
-    deleted_files = []
-    if idx_path.exists():
-        idx_path.unlink()
-        deleted_files.append(str(idx_path))
-    if meta_path.exists():
-        meta_path.unlink()
-        deleted_files.append(str(meta_path))
-    _cache.pop("store", None)
-    _cache.pop("pipeline", None)
-    _cache.pop("ingestion", None)
+    deleted_files = _delete_index_files()
+    reset_store()
     logger.info("Index cleared (deleted: %s)", deleted_files)
-    return {"cleared": True, "deleted_files": deleted_files}
+    return ORJSONResponse({"cleared": True, "deleted_files": deleted_files})
 
 
 # ── Cloud Model Listing & Connection Test ────────────────
 
 
 @router.get("/cloud/models", response_model=CloudModelsResponse)
-def cloud_models():
+def cloud_models(client=Depends(get_llm_client)):
     """List models available from the configured cloud provider."""
     settings = get_settings()
     if settings.llm_provider != "cloud":
@@ -543,9 +742,6 @@ def cloud_models():
             status_code=400,
             detail="Cloud endpoints require llm_provider='cloud'.",
         )
-    from app.services.llm.cloud_client import CloudLLMClient
-
-    client = get_llm_client()
     if not isinstance(client, CloudLLMClient):
         raise HTTPException(status_code=500, detail="LLM client is not a CloudLLMClient")
 
@@ -564,12 +760,11 @@ def test_cloud_connection(req: ConnectionTestRequest = None):
     if not api_key:
         return ConnectionTestResponse(success=False, message="No API key configured.")
 
-    from app.services.llm.cloud_client import CloudLLMClient
-
     temp_client = CloudLLMClient(
         api_key=api_key,
         base_url=base_url,
         model=settings.cloud_model,
+        http_client=get_http_client(),
     )
     result = temp_client.test_connection()
     return ConnectionTestResponse(**result)
@@ -677,7 +872,7 @@ def delete_profile(profile_id: str):
         data["active_profile_id"] = None
     _save_profiles(data)
     logger.info("Deleted API profile: %s", profile_id)
-    return {"deleted": True}
+    return ORJSONResponse({"deleted": True})
 
 
 @router.post("/profiles/{profile_id}/activate")
@@ -693,24 +888,24 @@ def activate_profile(profile_id: str):
         raise HTTPException(status_code=404, detail="Profile not found.")
 
     settings = get_settings()
-    settings.llm_provider = target.get("llm_provider", "cloud")
+    changes = {
+        "llm_provider": target.get("llm_provider", "cloud"),
+        "cloud_base_url": target.get("cloud_base_url", settings.cloud_base_url),
+        "cloud_model": target.get("cloud_model", settings.cloud_model),
+    }
     if target.get("cloud_api_key"):
-        settings.cloud_api_key = target["cloud_api_key"]
-    settings.cloud_base_url = target.get("cloud_base_url", settings.cloud_base_url)
-    settings.cloud_model = target.get("cloud_model", settings.cloud_model)
+        changes["cloud_api_key"] = target["cloud_api_key"]
+    update_settings(**changes)
 
-    _cache.pop("llm", None)
-    _cache.pop("pipeline", None)
+    reset_llm()
 
     data["active_profile_id"] = profile_id
     _save_profiles(data)
     logger.info("Activated API profile: %s (%s)", target["name"], profile_id)
-    return {"activated": True, "profile_id": profile_id, "name": target["name"]}
+    return ORJSONResponse({"activated": True, "profile_id": profile_id, "name": target["name"]})
 
 
-@router.get("/settings/llm", response_model=LLMSettingsResponse)
-def get_llm_settings():
-    """Read current LLM and RAG tuning parameters."""
+def _llm_settings_view() -> LLMSettingsResponse:
     settings = get_settings()
     return LLMSettingsResponse(
         temperature=settings.temperature,
@@ -723,35 +918,32 @@ def get_llm_settings():
     )
 
 
+@router.get("/settings/llm", response_model=None, responses={200: {"model": LLMSettingsResponse}})
+def get_llm_settings():
+    """Read current LLM and RAG tuning parameters."""
+    return _settings_view("llm", _llm_settings_view)
+
+
 @router.put("/settings/llm", response_model=LLMSettingsResponse)
 def update_llm_settings(req: LLMSettingsUpdateRequest):
     """Update LLM/RAG tuning parameters at runtime."""
-    settings = get_settings()
+    update_settings(**req.model_dump(exclude_none=True))
     llm = get_llm_client()
 
     if req.temperature is not None:
-        settings.temperature = req.temperature
         if hasattr(llm, 'temperature'):
             llm.temperature = req.temperature
     if req.top_p is not None:
-        settings.top_p = req.top_p
         if hasattr(llm, 'top_p'):
             llm.top_p = req.top_p
     if req.max_tokens is not None:
-        settings.max_tokens = req.max_tokens
         if hasattr(llm, 'max_tokens'):
             llm.max_tokens = req.max_tokens
-    if req.chunk_size is not None:
-        settings.chunk_size = req.chunk_size
-    if req.chunk_overlap is not None:
-        settings.chunk_overlap = req.chunk_overlap
     if req.top_k is not None:
-        settings.top_k = req.top_k
         pipeline = get_rag_pipeline()
         if hasattr(pipeline, 'top_k'):
             pipeline.top_k = req.top_k
     if req.similarity_threshold is not None:
-        settings.similarity_threshold = req.similarity_threshold
         pipeline = get_rag_pipeline()
         if hasattr(pipeline, 'similarity_threshold'):
             pipeline.similarity_threshold = req.similarity_threshold
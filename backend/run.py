@@ -1,11 +1,15 @@
 """Entry point for running the Nexa Support backend server."""
 
-import uvicorn
-
-from app.config.settings import get_settings
+import sys
 
 
 def main() -> None:
+    # Imported here so tooling that only imports this module to find the
+    # entry point does not pay for uvicorn and the settings machinery.
+    import uvicorn
+
+    from app.config.settings import get_settings
+
     settings = get_settings()
     uvicorn.run(
         "app.main:app",
@@ -13,6 +17,11 @@ def main() -> None:
         port=settings.port,
         reload=False,
         log_level=settings.log_level.lower(),
+        # Named explicitly so a broken uvicorn[standard] install fails at
+        # startup instead of quietly falling back to asyncio/h11.  uvloop
+        # has no Windows build.
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
     )
 
 
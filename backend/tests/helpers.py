@@ -0,0 +1,170 @@
+"""Mock services and client builders shared by the backend tests.
+
+All heavy services (LLM, embeddings, vector-store, pipeline, ingestion)
+are replaced with lightweight mocks so tests run instantly without GPUs,
+models, or network access.  Fixtures live in ``conftest.py``; test
+modules import the mocks from here.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
+
+from fastapi.testclient import TestClient
+
+from app.services.llm.base import LLMClient
+
+
+# ── Mock implementations ────────────────────────────────
+
+
+class MockLLMClient(LLMClient):
+    """Fake LLM that always returns a fixed answer."""
+
+    def generate(self, prompt: str, system_prompt: str = "") -> str:
+        return "Mock LLM answer based on provided context."
+
+    def health_check(self) -> bool:
+        return True
+
+
+class MockLLMClientUnhealthy(LLMClient):
+    def generate(self, prompt: str, system_prompt: str = "") -> str:
+        raise ConnectionError("LLM not reachable")
+
+    def health_check(self) -> bool:
+        return False
+
+
+class MockEmbedder:
+    dimension = 384
+    # Shared by every call; nothing downstream mutates embedding lists.
+    _VEC: ClassVar[List[float]] = [0.1] * 384
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._VEC] * len(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._VEC
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_documents(texts)
+
+
+class MockVectorStore:
+    def __init__(self) -> None:
+        self._texts: List[str] = []
+        self._meta: List[Dict[str, Any]] = []
+
+    def add_texts(
+        self,
+        texts: List[str],
+        embeddings: List[List[float]],
+        metadatas: List[Dict[str, Any]],
+    ) -> None:
+        self._texts.extend(texts)
+        self._meta.extend(metadatas)
+
+    def search(
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        score_threshold: float,
+    ) -> List[Tuple[str, float, Dict[str, Any]]]:
+        return [
+            (
+                "Nexa supports multiple deployment modes.",
+                0.92,
+                {"document_name": "deploy.md", "text": "Nexa supports multiple deployment modes."},
+            )
+        ]
+
+    def search_batch(self, query_embeddings, top_k, score_threshold):
+        return [self.search(q, top_k, score_threshold) for q in query_embeddings]
+
+    def save(self) -> None:
+        pass
+
+
+class MockVectorStoreEmpty(MockVectorStore):
+    """Returns no results — triggers refusal response."""
+
+    def search(self, *_a, **_kw):  # type: ignore[override]
+        return []
+
+
+class MockPipeline:
+    def generate(self, query: str) -> Tuple[str, List[str]]:
+        return ("Mock answer from pipeline.", ["doc1.md"])
+
+    def generate_batch(self, queries: List[str]) -> List[Tuple[str, List[str]]]:
+        return [self.generate(q) for q in queries]
+
+    async def agenerate(self, query: str) -> Tuple[str, List[str]]:
+        return self.generate(query)
+
+    def generate_stream(self, query: str):
+        yield ("sources", ["doc1.md"])
+        yield ("token", "Mock ")
+        yield ("token", "answer.")
+        yield ("done", "")
+
+    async def agenerate_stream(self, query: str):
+        for event in self.generate_stream(query):
+            yield event
+
+
+class MockPipelineNoContext:
+    def generate(self, query: str) -> Tuple[str, List[str]]:
+        return (
+            "I can only help with questions related to Nexa. "
+            "This information is not available in the documentation.",
+            [],
+        )
+
+    async def agenerate(self, query: str) -> Tuple[str, List[str]]:
+        return self.generate(query)
+
+
+class MockIngestionService:
+    def ingest_paths(
+        self,
+        paths: List[str],
+        tags: Optional[List[str]] = None,
+        version: Optional[str] = None,
+    ) -> int:
+        return 5
+
+
+# ── Client ──────────────────────────────────────────────
+
+
+@lru_cache(maxsize=1)
+def _shared_client() -> TestClient:
+    """Client over the app under test, built once per session.
+
+    Tests only swap the app's dependency overrides between runs.
+    """
+    from app.main import create_app
+
+    return TestClient(create_app())
+
+
+def build_client(**services: Any) -> TestClient:
+    """Return a client whose named dependencies are overridden by mocks."""
+    import app.dependencies as deps
+
+    factories = {
+        "llm": deps.get_llm_client,
+        "embedder": deps.get_embedder,
+        "store": deps.get_vector_store,
+        "pipeline": deps.get_rag_pipeline,
+        "ingestion": deps.get_ingestion_service,
+    }
+    client = _shared_client()
+    overrides = client.app.dependency_overrides
+    overrides.clear()
+    for name, service in services.items():
+        overrides[factories[name]] = lambda service=service: service
+    return client
@@ -33,3 +33,49 @@ class TestChat:
         assert resp.status_code == 200
         body = resp.json()
         assert body["answer"]
+
+    def test_controller_reused_per_pipeline(self):
+        from app.views.api import chat_controller
+        from tests.helpers import MockPipeline
+
+        pipeline = MockPipeline()
+        assert chat_controller(pipeline) is chat_controller(pipeline)
+        assert chat_controller(MockPipeline()).pipeline is not pipeline
+
+
+class TestChatStream:
+    def test_stream_emits_sse_events(self, client):
+        resp = client.post("/api/chat/stream", json={"message": "How do I deploy Nexa?"})
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        body = resp.text
+        assert body.index("event: sources") < body.index("event: token")
+        assert 'data: "Mock "' in body
+        assert body.rstrip().endswith('event: done\ndata: ""')
+
+    def test_stream_whitespace_only_rejected(self, client):
+        resp = client.post("/api/chat/stream", json={"message": "   "})
+        assert resp.status_code == 400
+
+
+class TestChatBatch:
+    def test_batch_answers_in_order(self, client):
+        resp = client.post(
+            "/api/chat/batch",
+            json={"messages": [{"message": "First?"}, {"message": "Second?"}]},
+        )
+        assert resp.status_code == 200
+        results = resp.json()["results"]
+        assert len(results) == 2
+        assert all(r["answer"] for r in results)
+
+    def test_batch_rejects_blank_message(self, client):
+        resp = client.post(
+            "/api/chat/batch",
+            json={"messages": [{"message": "ok"}, {"message": "   "}]},
+        )
+        assert resp.status_code == 400
+
+    def test_batch_empty_rejected(self, client):
+        resp = client.post("/api/chat/batch", json={"messages": []})
+        assert resp.status_code == 422
@@ -2,31 +2,45 @@
 
 import pytest
 
-from app.services.ingestion.chunker import chunk_text
+from app.services.ingestion.chunker import chunk_stream, chunk_text
 
 
-class TestChunker:
-    def test_empty_text(self):
-        assert chunk_text("") == []
+_WORDS = " ".join(f"w{i}" for i in range(20))
+
 
-    def test_short_text_single_chunk(self):
-        text = "one two three"
-        chunks = chunk_text(text, chunk_size=10, chunk_overlap=2)
-        assert len(chunks) == 1
-        assert chunks[0] == text
+class TestChunker:
+    @pytest.mark.parametrize(
+        "text, kwargs, expected",
+        [
+            ("", {}, []),
+            ("one two three", {"chunk_size": 10, "chunk_overlap": 2}, ["one two three"]),
+            ("short", {"chunk_size": 1000}, ["short"]),
+            (
+                _WORDS,
+                {"chunk_size": 10, "chunk_overlap": 0},
+                [" ".join(f"w{i}" for i in range(10)), " ".join(f"w{i}" for i in range(10, 20))],
+            ),
+            # chunks are slices of the original text, inner whitespace kept
+            (
+                "  alpha beta\n\ngamma   delta epsilon  ",
+                {"chunk_size": 3, "chunk_overlap": 1},
+                ["alpha beta\n\ngamma", "gamma   delta epsilon"],
+            ),
+        ],
+        ids=["empty", "single-chunk", "size-larger-than-text", "no-overlap", "slices-of-original"],
+    )
+    def test_chunk_text(self, text, kwargs, expected):
+        assert chunk_text(text, **kwargs) == expected
 
     def test_overlap_produces_extra_chunks(self):
-        words = " ".join(f"w{i}" for i in range(20))
-        chunks = chunk_text(words, chunk_size=10, chunk_overlap=3)
+        chunks = chunk_text(_WORDS, chunk_size=10, chunk_overlap=3)
         assert len(chunks) >= 2
         # overlap means some words appear in multiple chunks
         assert chunks[0].split()[-1] in chunks[1]
 
-    def test_no_overlap(self):
-        words = " ".join(f"w{i}" for i in range(20))
-        chunks = chunk_text(words, chunk_size=10, chunk_overlap=0)
-        assert len(chunks) == 2
-
-    def test_chunk_size_larger_than_text(self):
-        text = "short"
-        assert chunk_text(text, chunk_size=1000) == ["short"]
+    def test_stream_matches_whole_text(self):
+        text = "alpha beta  gamma\ndelta epsilon zeta eta theta"
+        pieces = ["alpha be", "ta  gam", "ma\ndelta eps", "", "ilon zeta eta theta"]
+        assert list(chunk_stream(pieces, chunk_size=3, chunk_overlap=1)) == chunk_text(
+            text, chunk_size=3, chunk_overlap=1
+        )
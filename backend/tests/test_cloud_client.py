@@ -0,0 +1,109 @@
+"""Tests for the OpenAI-compatible cloud client."""
+
+import httpx
+
+from app.services.llm.cloud_client import CloudLLMClient
+
+
+def _client(handler) -> CloudLLMClient:
+    return CloudLLMClient(
+        api_key="sk-test",
+        base_url="https://llm.example/v1",
+        model="m",
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+
+
+class TestCloudStream:
+    def test_yields_sse_deltas(self):
+        seen = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen["body"] = request.content
+            seen["auth"] = request.headers["authorization"]
+            body = (
+                b'data: {"choices":[{"delta":{"role":"assistant"}}]}\n\n'
+                b'data: {"choices":[{"delta":{"content":"Hel"}}]}\n\n'
+                b": keep-alive\n\n"
+                b'data: {"choices":[{"delta":{"content":"lo"}}]}\n\n'
+                b"data: [DONE]\n\n"
+            )
+            return httpx.Response(200, content=body, headers={"content-type": "text/event-stream"})
+
+        tokens = list(_client(handler).generate_stream("hi", "sys"))
+        assert tokens == ["Hel", "lo"]
+        assert b'"stream":true' in seen["body"].replace(b" ", b"")
+        assert seen["auth"] == "Bearer sk-test"
+
+
+class TestAsyncCloudClient:
+    def test_concurrent_agenerate(self):
+        import asyncio
+
+        import orjson
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            prompt = orjson.loads(request.content)["messages"][-1]["content"]
+            return httpx.Response(
+                200, json={"choices": [{"message": {"content": f" echo {prompt} "}}]}
+            )
+
+        client = _client(lambda request: httpx.Response(500))
+        client._aclient = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        assert asyncio.run(client.agenerate_many(["a", "b", "c"])) == ["echo a", "echo b", "echo c"]
+
+    def test_agenerate_stream_yields_sse_deltas(self):
+        import asyncio
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.headers["authorization"] == "Bearer sk-test"
+            body = (
+                b'data: {"choices":[{"delta":{"content":"Hel"}}]}\n\n'
+                b'data: {"choices":[{"delta":{"content":"lo"}}]}\n\n'
+                b"data: [DONE]\n\n"
+            )
+            return httpx.Response(200, content=body, headers={"content-type": "text/event-stream"})
+
+        client = _client(lambda request: httpx.Response(500))
+        client._aclient = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        async def collect():
+            return [token async for token in client.agenerate_stream("hi")]
+
+        assert asyncio.run(collect()) == ["Hel", "lo"]
+
+    def test_connection_reports_auth_failure(self):
+        result = _client(lambda request: httpx.Response(401)).test_connection()
+        assert result["success"] is False
+        assert "Authentication" in result["message"]
+
+
+class TestCloudModelsCache:
+    def test_models_endpoint_hit_once_within_ttl(self):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            return httpx.Response(200, json={"data": [{"id": "m1", "owned_by": "x"}]})
+
+        client = _client(handler)
+        assert client.health_check() is True
+        assert client.list_models() == [{"id": "m1", "owned_by": "x"}]
+        assert client.test_connection()["models_count"] == 1
+        assert calls == ["/v1/models"]
+
+        client.models_ttl = 0
+        client.list_models()
+        assert len(calls) == 2
+
+    def test_error_response_not_cached(self):
+        statuses = iter([500, 200])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            status = next(statuses)
+            return httpx.Response(status, json={"data": [{"id": "m1"}]} if status == 200 else {})
+
+        client = _client(handler)
+        assert client.health_check() is False
+        assert client.list_models() == [{"id": "m1", "owned_by": ""}]
+        assert client.health_check() is True
@@ -32,3 +32,71 @@ class TestHealth:
         body = resp.json()
         assert body["status"] == "degraded"
         assert body["llm_connected"] is False
+
+
+class TestHealthController:
+    def test_result_cached_within_ttl(self):
+        from app.controllers.health_controller import HealthController
+
+        class CountingLLM:
+            calls = 0
+
+            def health_check(self) -> bool:
+                self.calls += 1
+                return True
+
+        llm = CountingLLM()
+        HealthController(llm).check_health()
+        HealthController(llm).check_health()
+        assert llm.calls == 1
+
+        HealthController(llm, ttl=0).check_health()
+        assert llm.calls == 2
+
+    def test_async_check_shares_cache(self):
+        import asyncio
+
+        from app.controllers.health_controller import HealthController
+
+        class CountingLLM:
+            calls = 0
+
+            def health_check(self) -> bool:
+                self.calls += 1
+                return True
+
+        llm = CountingLLM()
+        controller = HealthController(llm)
+        assert asyncio.run(controller.acheck_health()).llm_connected is True
+        assert controller.check_health() is asyncio.run(controller.acheck_health())
+        assert llm.calls == 1
+
+
+class TestCors:
+    def _preflight(self, client, origin):
+        return client.options(
+            "/api/health",
+            headers={"Origin": origin, "Access-Control-Request-Method": "GET"},
+        )
+
+    def test_allowed_origin(self, client):
+        resp = self._preflight(client, "http://localhost:8080")
+        assert resp.status_code == 200
+        assert resp.headers["access-control-allow-origin"] == "http://localhost:8080"
+
+    def test_unknown_origin_rejected(self, client):
+        resp = self._preflight(client, "http://evil.example")
+        assert resp.status_code == 400
+
+
+class TestStaticAssets:
+    def test_hashed_assets_cached_immutably(self, client):
+        from pathlib import Path
+
+        assets = Path(__file__).resolve().parents[1] / "static" / "assets"
+        css = next(assets.glob("*.css"), None)
+        if css is None:
+            pytest.skip("no bundled frontend assets")
+        resp = client.get(f"/assets/{css.name}")
+        assert resp.status_code == 200
+        assert "immutable" in resp.headers["cache-control"]
@@ -0,0 +1,179 @@
+"""Tests for the chat session history service."""
+
+import pytest
+
+from app.models.schemas import HistoryMessage, SessionCreate
+from app.services.history import HistoryService
+
+
+@pytest.fixture()
+def history(tmp_path):
+    return HistoryService(base_dir=tmp_path)
+
+
+def _session(session_id: str, *texts: str) -> SessionCreate:
+    return SessionCreate(
+        id=session_id,
+        title=f"Session {session_id}",
+        messages=[HistoryMessage(role="user", text=t) for t in texts],
+    )
+
+
+class TestHistoryService:
+    def test_save_and_get_roundtrip(self, history):
+        history.save_session(_session("s1", "héllo", "wörld"))
+        detail = history.get_session("s1")
+        assert detail is not None
+        assert [m.text for m in detail.messages] == ["héllo", "wörld"]
+        assert detail.created_at and detail.updated_at
+
+    def test_update_keeps_created_at(self, history):
+        first = history.save_session(_session("s1", "a"))
+        second = history.save_session(_session("s1", "a", "b"))
+        assert second.created_at == first.created_at
+        assert len(history.get_session("s1").messages) == 2
+
+    def test_list_sessions(self, history):
+        history.save_session(_session("s1", "a"))
+        history.save_session(_session("s2", "a", "b"))
+        summaries = {s.id: s for s in history.list_sessions()}
+        assert set(summaries) == {"s1", "s2"}
+        assert summaries["s2"].message_count == 2
+
+    def test_delete_session(self, history):
+        history.save_session(_session("s1", "a"))
+        assert history.delete_session("s1") is True
+        assert history.get_session("s1") is None
+        assert history.delete_session("s1") is False
+        assert history.list_sessions() == []
+
+    def test_settled_listing_reused_until_directory_changes(self, history, tmp_path):
+        import os
+
+        history.save_session(_session("s1", "a"))
+        os.utime(tmp_path, ns=(0, 0))  # directory quiet since long ago
+        assert [s.id for s in history.list_sessions()] == ["s1"]
+        assert history._listing is not None
+        history.save_session(_session("s2", "a"))
+        assert {s.id for s in history.list_sessions()} == {"s1", "s2"}
+
+    def test_delete_all(self, history, tmp_path):
+        doc = tmp_path / "upload.txt"
+        doc.write_text("x")
+        history.save_session(_session("s1", "a"))
+        history.save_session(SessionCreate(id="s2", title="T", messages=[], documents=[str(doc)]))
+        assert len(history.list_sessions()) == 2
+        assert history.delete_all() == 2
+        assert history.list_sessions() == []
+        assert sorted(p.name for p in tmp_path.iterdir()) == []
+
+    def test_growing_session_appends_messages(self, history, tmp_path):
+        history.save_session(_session("s1", "a"))
+        log = tmp_path / "s1.messages.jsonl.zst"
+        before = log.read_bytes()
+        history.save_session(_session("s1", "a", "b"))
+        assert log.read_bytes().startswith(before)
+        assert [m.text for m in history.get_session("s1").messages] == ["a", "b"]
+
+    def test_edited_history_is_rewritten(self, history):
+        history.save_session(_session("s1", "a", "b"))
+        history.save_session(_session("s1", "x", "b", "c"))
+        assert [m.text for m in history.get_session("s1").messages] == ["x", "b", "c"]
+
+    def test_list_reads_only_metadata(self, history, tmp_path):
+        history.save_session(_session("s1", "a", "b"))
+        (tmp_path / "s1.messages.jsonl.zst").write_bytes(b"corrupt")
+        [summary] = history.list_sessions()
+        assert summary.message_count == 2
+
+    def test_legacy_single_file_is_read_and_migrated(self, history, tmp_path):
+        legacy = tmp_path / "old.json"
+        legacy.write_text(
+            '{"id": "old", "title": "Old", "messages": [{"role": "user", "text": "hi"}],'
+            ' "documents": [], "created_at": "2024-01-01T00:00:00+00:00", "updated_at": ""}'
+        )
+        [summary] = history.list_sessions()
+        assert (summary.id, summary.message_count) == ("old", 1)
+        assert [m.text for m in history.get_session("old").messages] == ["hi"]
+
+        saved = history.save_session(_session("old", "hi", "again"))
+        assert saved.created_at == "2024-01-01T00:00:00+00:00"
+        assert not legacy.exists()
+        assert [s.id for s in history.list_sessions()] == ["old"]
+
+    def test_list_reuses_cached_summaries(self, history, tmp_path):
+        import os
+
+        history.save_session(_session("s1", "a"))
+        history.list_sessions()
+
+        meta = tmp_path / "s1.meta.json"
+        st = meta.stat()
+        meta.write_bytes(b"x" * st.st_size)  # same size, unparseable
+        os.utime(meta, ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert [s.id for s in history.list_sessions()] == ["s1"]
+
+        os.utime(meta, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+        assert history.list_sessions() == []
+
+    def test_interrupted_append_is_discarded(self, history, tmp_path):
+        history.save_session(_session("s1", "a"))
+        with open(tmp_path / "s1.messages.jsonl.zst", "ab") as fh:
+            fh.write(b"\x28\xb5\x2f")  # torn frame from a crashed save
+        assert [m.text for m in history.get_session("s1").messages] == ["a"]
+
+        history.save_session(_session("s1", "a", "b"))
+        assert [m.text for m in history.get_session("s1").messages] == ["a", "b"]
+
+    def test_crash_before_rewritten_metadata_keeps_old_session(self, history, tmp_path, monkeypatch):
+        from app.services import history as history_module
+
+        history.save_session(_session("s1", "a", "b"))
+        write_atomic = history_module._write_atomic
+
+        def crash_on_meta(path, data):
+            if path.name.endswith(".meta.json"):
+                raise OSError("crashed before the metadata was replaced")
+            write_atomic(path, data)
+
+        monkeypatch.setattr(history_module, "_write_atomic", crash_on_meta)
+        with pytest.raises(OSError):
+            history.save_session(_session("s1", "x", "y", "z"))
+        monkeypatch.undo()
+
+        assert [m.text for m in history.get_session("s1").messages] == ["a", "b"]
+        history.save_session(_session("s1", "x", "y"))
+        assert [m.text for m in history.get_session("s1").messages] == ["x", "y"]
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "s1.messages.jsonl.zst.1",
+            "s1.meta.json",
+        ]
+
+        assert history.delete_session("s1")
+        assert list(tmp_path.iterdir()) == []
+
+    def test_uncompressed_message_log_is_read_and_migrated(self, history, tmp_path):
+        history.save_session(_session("s1", "a", "b"))
+        (tmp_path / "s1.messages.jsonl.zst").unlink()
+        (tmp_path / "s1.messages.jsonl").write_bytes(
+            b'{"role":"user","text":"a"}\n{"role":"user","text":"b"}\n'
+        )
+        assert [m.text for m in history.get_session("s1").messages] == ["a", "b"]
+
+        history.save_session(_session("s1", "a", "b", "c"))
+        assert not (tmp_path / "s1.messages.jsonl").exists()
+        assert [m.text for m in history.get_session("s1").messages] == ["a", "b", "c"]
+
+
+class TestSessionEndpoints:
+    def test_list_and_get_serialize_models(self, client, tmp_path, monkeypatch):
+        import app.views.api as api
+
+        monkeypatch.setattr(api, "_history", HistoryService(base_dir=tmp_path))
+        assert client.post("/api/sessions", json={"id": "s1", "title": "T", "messages": []}).status_code == 200
+
+        resp = client.get("/api/sessions")
+        assert resp.headers["content-type"] == "application/json"
+        assert [s["id"] for s in resp.json()["sessions"]] == ["s1"]
+        assert client.get("/api/sessions/s1").json()["title"] == "T"
+        assert client.get("/api/sessions/missing").status_code == 404
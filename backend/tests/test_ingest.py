@@ -28,3 +28,191 @@ class TestIngest:
     def test_ingest_missing_paths(self, client):
         resp = client.post("/api/ingest", json={})
         assert resp.status_code == 422
+
+
+class TestIngestionServiceBatching:
+    def test_chunks_embedded_in_windows(self, tmp_path):
+        from app.services.ingestion.ingest_service import IngestionService
+        from tests.helpers import MockEmbedder, MockVectorStore
+
+        for i in range(3):
+            (tmp_path / f"doc{i}.txt").write_text(" ".join(f"w{j}" for j in range(50)))
+
+        class CountingEmbedder(MockEmbedder):
+            def __init__(self) -> None:
+                self.calls: list = []
+
+            def embed_documents(self, texts):
+                self.calls.append(len(texts))
+                return super().embed_documents(texts)
+
+        embedder = CountingEmbedder()
+        store = MockVectorStore()
+        service = IngestionService(embedder, store, chunk_size=10, chunk_overlap=0, batch_size=4)
+
+        count = service.ingest_paths([str(tmp_path)])
+        assert count == 15
+        # windows are embedded concurrently, so call order is not fixed
+        assert sorted(embedder.calls) == [3, 4, 4, 4]
+        assert len(store._texts) == 15
+
+    def test_prefetched_windows_stored_in_order(self, tmp_path):
+        import time
+
+        from app.services.ingestion.ingest_service import IngestionService
+        from tests.helpers import MockEmbedder, MockVectorStore
+
+        (tmp_path / "doc.txt").write_text(" ".join(f"w{j}" for j in range(12)))
+
+        class SlowFirstEmbedder(MockEmbedder):
+            def embed_documents(self, texts):
+                if texts[0] == "w0":
+                    time.sleep(0.05)
+                return super().embed_documents(texts)
+
+        store = MockVectorStore()
+        service = IngestionService(
+            SlowFirstEmbedder(), store, chunk_size=1, chunk_overlap=0, batch_size=3, prefetch=2
+        )
+
+        assert service.ingest_paths([str(tmp_path)]) == 12
+        assert store._texts == [f"w{j}" for j in range(12)]
+
+    def test_embedding_cache_skips_seen_chunks(self, tmp_path):
+        from app.services.ingestion.ingest_service import IngestionService
+        from app.services.rag.embedding_cache import EmbeddingCache
+        from tests.helpers import MockEmbedder, MockVectorStore
+
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        (docs / "a.txt").write_text(" ".join(f"w{j}" for j in range(20)))
+
+        class CountingEmbedder(MockEmbedder):
+            def __init__(self) -> None:
+                self.embedded: list = []
+
+            def embed_documents(self, texts):
+                self.embedded.extend(texts)
+                return super().embed_documents(texts)
+
+        embedder = CountingEmbedder()
+        cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"), "mock")
+        service = IngestionService(
+            embedder, MockVectorStore(), chunk_size=10, chunk_overlap=0, cache=cache
+        )
+
+        assert service.ingest_paths([str(docs)]) == 2
+        assert len(embedder.embedded) == 2
+
+        (docs / "b.txt").write_text("fresh words")
+        store = MockVectorStore()
+        service.store = store
+        assert service.ingest_paths([str(docs)]) == 3
+        assert embedder.embedded[2:] == ["fresh words"]
+        assert len(store._texts) == 3
+
+    def test_near_duplicate_chunks_reuse_cached_vectors(self, tmp_path):
+        from app.services.ingestion.ingest_service import IngestionService
+        from app.services.rag.embedding_cache import EmbeddingCache
+        from tests.helpers import MockEmbedder, MockVectorStore
+
+        class CountingEmbedder(MockEmbedder):
+            def __init__(self) -> None:
+                self.embedded: list = []
+
+            def embed_documents(self, texts):
+                self.embedded.extend(texts)
+                return super().embed_documents(texts)
+
+        words = " ".join(f"word{j}" for j in range(60))
+        doc = tmp_path / "a.txt"
+        doc.write_text(words)
+
+        embedder = CountingEmbedder()
+        cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"), "mock")
+        service = IngestionService(embedder, MockVectorStore(), chunk_size=100, cache=cache)
+        service.ingest_paths([str(doc)])
+
+        doc.write_text(words.replace(" ", "  \n", 5))  # whitespace-only edit
+        service.ingest_paths([str(doc)])
+        assert len(embedder.embedded) == 1
+
+        doc.write_text(f"brand new text {words[:20]}")
+        service.ingest_paths([str(doc)])
+        assert len(embedder.embedded) == 2
+
+    def test_document_failing_midway_is_skipped_whole(self, tmp_path, monkeypatch):
+        from app.services.ingestion import ingest_service
+        from app.services.ingestion.ingest_service import IngestionService
+        from tests.helpers import MockEmbedder, MockVectorStore
+
+        def pieces(ok):
+            yield " ".join(f"w{j}" for j in range(30))
+            if not ok:
+                raise OSError("read failed")
+
+        monkeypatch.setattr(
+            ingest_service,
+            "iter_documents",
+            lambda paths: iter([("good.txt", pieces(True)), ("torn.pdf", pieces(False))]),
+        )
+        store = MockVectorStore()
+        service = IngestionService(MockEmbedder(), store, chunk_size=10, chunk_overlap=0)
+        assert service.ingest_paths([str(tmp_path)]) == 3
+        assert all("torn" not in m["source_path"] for m in store._meta)
+
+    def test_process_pool_chunking_matches_in_process(self, tmp_path):
+        from app.services.ingestion.ingest_service import IngestionService
+        from tests.helpers import MockEmbedder, MockVectorStore
+
+        for i in range(4):
+            (tmp_path / f"doc{i}.txt").write_text(" ".join(f"d{i}w{j}" for j in range(25)))
+        (tmp_path / "bad.pdf").write_bytes(b"not a pdf")
+
+        results = []
+        for processes in (0, 2):
+            store = MockVectorStore()
+            service = IngestionService(
+                MockEmbedder(), store, chunk_size=10, chunk_overlap=2, processes=processes
+            )
+            assert service.ingest_paths([str(tmp_path)]) == 12
+            results.append(store._texts)
+        assert results[0] == results[1]
+
+
+class TestUpload:
+    def test_upload_streams_to_disk(self, client, tmp_path, monkeypatch):
+        import app.views.api as api
+
+        monkeypatch.setattr(api, "UPLOAD_DIR", tmp_path)
+        monkeypatch.setattr(api, "UPLOAD_CHUNK_SIZE", 4)
+        resp = client.post("/api/upload", files={"files": ("notes.txt", b"0123456789", "text/plain")})
+        assert resp.status_code == 200
+        info = resp.json()["files"][0]
+        assert info["size"] == 10
+        assert open(info["saved_path"], "rb").read() == b"0123456789"
+
+    def test_upload_refreshes_file_listing(self, client, tmp_path, monkeypatch):
+        import app.views.api as api
+
+        monkeypatch.setattr(api, "UPLOAD_DIR", tmp_path)
+        assert client.get("/api/uploads").json()["files"] == []
+        client.post("/api/upload", files={"files": ("notes.txt", b"abc", "text/plain")})
+        files = client.get("/api/uploads").json()["files"]
+        assert [f["size"] for f in files] == [3]
+        assert client.delete(f"/api/uploads/{files[0]['name']}").status_code == 200
+        assert client.get("/api/uploads").json()["files"] == []
+
+    def test_bad_file_in_batch_writes_nothing(self, client, tmp_path, monkeypatch):
+        import app.views.api as api
+
+        monkeypatch.setattr(api, "UPLOAD_DIR", tmp_path)
+        resp = client.post(
+            "/api/upload",
+            files=[
+                ("files", ("ok.txt", b"fine", "text/plain")),
+                ("files", ("bad.exe", b"nope", "application/octet-stream")),
+            ],
+        )
+        assert resp.status_code == 400
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,81 @@
+"""Tests for the document loader."""
+
+import pytest
+
+from app.services.ingestion.loader import gather_documents, iter_documents, load_file
+
+
+class TestGatherDocuments:
+    def test_walks_directories_in_sorted_order(self, tmp_path):
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "b.txt").write_text("bee")
+        (tmp_path / "a.md").write_text("ay")
+        (tmp_path / "sub" / "c.rst").write_text("see")
+        (tmp_path / "skip.bin").write_bytes(b"\x00")
+
+        docs = gather_documents([str(tmp_path)])
+        assert [text for _, text in docs] == ["ay", "bee", "see"]
+
+    def test_missing_path_skipped(self, tmp_path):
+        assert gather_documents([str(tmp_path / "nope")]) == []
+
+    def test_unsupported_file_rejected(self, tmp_path):
+        f = tmp_path / "x.bin"
+        f.write_bytes(b"\x00")
+        with pytest.raises(ValueError):
+            gather_documents([str(f)])
+
+    def test_unreadable_file_reported(self, tmp_path):
+        (tmp_path / "good.txt").write_text("fine")
+        (tmp_path / "bad.pdf").write_bytes(b"not a pdf")
+        with pytest.raises(ValueError, match="bad.pdf"):
+            gather_documents([str(tmp_path)])
+
+
+class TestIterDocuments:
+    def test_pieces_join_to_loaded_text(self, tmp_path, monkeypatch):
+        from app.services.ingestion import loader
+
+        monkeypatch.setattr(loader, "_WINDOW_BYTES", 8)
+        f = tmp_path / "long.txt"
+        f.write_text("word " * 40)
+
+        [(path, pieces)] = list(iter_documents([str(tmp_path)]))
+        pieces = list(pieces)
+        assert len(pieces) == 25
+        assert "".join(pieces) == load_file(path)
+
+    def test_windows_keep_multibyte_and_crlf_intact(self, tmp_path, monkeypatch):
+        from app.services.ingestion import loader
+
+        monkeypatch.setattr(loader, "_WINDOW_BYTES", 3)
+        f = tmp_path / "mixed.md"
+        f.write_bytes("héllo wörld\r\nzweite ß zeile\r\n".encode("utf-8"))
+
+        [(path, pieces)] = list(iter_documents([str(f)]))
+        assert "".join(pieces) == load_file(path) == "héllo wörld\nzweite ß zeile\n"
+
+
+class TestLoadCsv:
+    def test_rows_joined_with_comma_space(self, tmp_path):
+        f = tmp_path / "t.csv"
+        f.write_text('name,note\r\nalpha,"one, two"\r\nbeta,"multi\nline"\r\n', newline="")
+        assert load_file(str(f)) == "name, note\nalpha, one, two\nbeta, multi\nline"
+
+
+class TestLoadDocx:
+    def test_extracts_text_runs(self, tmp_path):
+        import zipfile
+
+        w = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+        xml = (
+            f'<w:document xmlns:w="{w}"><w:body>'
+            "<w:p><w:r><w:t>Hello</w:t></w:r><w:r><w:t>world</w:t></w:r></w:p>"
+            "<w:p><w:r><w:t></w:t></w:r><w:r><w:t>again</w:t></w:r></w:p>"
+            "</w:body></w:document>"
+        )
+        f = tmp_path / "doc.docx"
+        with zipfile.ZipFile(f, "w") as z:
+            z.writestr("word/document.xml", xml)
+
+        assert load_file(str(f)) == "Hello world again"
@@ -8,11 +8,20 @@ import pytest
 from fastapi.testclient import TestClient
 
 from app.services.llm.ollama_client import OllamaClient
+from tests.helpers import build_client
 
 
 # ── Mock Ollama client (inherits OllamaClient so isinstance checks pass) ────
 
 
+# Canned server responses, built once; the endpoints only read them.
+_MODELS: List[Dict[str, Any]] = [
+    {"name": "mistral:latest", "size": 4_000_000_000, "digest": "abc123"},
+    {"name": "llama3:latest", "size": 8_000_000_000, "digest": "def456"},
+]
+_MODEL_INFO: Dict[str, Any] = {"modelfile": "FROM mistral", "parameters": "temperature 0.2"}
+
+
 class MockOllamaClient(OllamaClient):
     """Fake OllamaClient — skips real __init__, stubs all methods."""
 
@@ -28,13 +37,10 @@ class MockOllamaClient(OllamaClient):
         return True
 
     def list_models(self) -> List[Dict[str, Any]]:
-        return [
-            {"name": "mistral:latest", "size": 4_000_000_000, "digest": "abc123"},
-            {"name": "llama3:latest", "size": 8_000_000_000, "digest": "def456"},
-        ]
+        return _MODELS
 
     def model_info(self, model_name: Optional[str] = None) -> Dict[str, Any]:
-        return {"modelfile": "FROM mistral", "parameters": "temperature 0.2"}
+        return _MODEL_INFO
 
 
 class MockOllamaClientDown(MockOllamaClient):
@@ -52,30 +58,23 @@ class MockOllamaClientDown(MockOllamaClient):
 def ollama_client() -> TestClient:
     import os
 
-    import app.dependencies as deps
-
-    deps.reset_cache()
     os.environ["LLM_PROVIDER"] = "ollama"
 
-    deps._cache["llm"] = MockOllamaClient()
-    deps._cache["embedder"] = type("E", (), {"dimension": 384})()
-    deps._cache["store"] = type("S", (), {})()
-    deps._cache["pipeline"] = type(
-        "P",
-        (),
-        {"generate": staticmethod(lambda q: ("answer", ["src.md"]))},
-    )()
-    deps._cache["ingestion"] = type(
-        "I",
-        (),
-        {"ingest_paths": staticmethod(lambda *a, **kw: 5)},
-    )()
-
-    from app.main import create_app
-
-    application = create_app()
-    yield TestClient(application)
-    deps.reset_cache()
+    yield build_client(
+        llm=MockOllamaClient(),
+        embedder=type("E", (), {"dimension": 384})(),
+        store=type("S", (), {})(),
+        pipeline=type(
+            "P",
+            (),
+            {"generate": staticmethod(lambda q: ("answer", ["src.md"]))},
+        )(),
+        ingestion=type(
+            "I",
+            (),
+            {"ingest_paths": staticmethod(lambda *a, **kw: 5)},
+        )(),
+    )
     os.environ.pop("LLM_PROVIDER", None)
 
 
@@ -83,30 +82,23 @@ def ollama_client() -> TestClient:
 def ollama_client_down() -> TestClient:
     import os
 
-    import app.dependencies as deps
-
-    deps.reset_cache()
     os.environ["LLM_PROVIDER"] = "ollama"
 
-    deps._cache["llm"] = MockOllamaClientDown()
-    deps._cache["embedder"] = type("E", (), {"dimension": 384})()
-    deps._cache["store"] = type("S", (), {})()
-    deps._cache["pipeline"] = type(
-        "P",
-        (),
-        {"generate": staticmethod(lambda q: ("answer", []))},
-    )()
-    deps._cache["ingestion"] = type(
-        "I",
-        (),
-        {"ingest_paths": staticmethod(lambda *a, **kw: 0)},
-    )()
-
-    from app.main import create_app
-
-    application = create_app()
-    yield TestClient(application)
-    deps.reset_cache()
+    yield build_client(
+        llm=MockOllamaClientDown(),
+        embedder=type("E", (), {"dimension": 384})(),
+        store=type("S", (), {})(),
+        pipeline=type(
+            "P",
+            (),
+            {"generate": staticmethod(lambda q: ("answer", []))},
+        )(),
+        ingestion=type(
+            "I",
+            (),
+            {"ingest_paths": staticmethod(lambda *a, **kw: 0)},
+        )(),
+    )
     os.environ.pop("LLM_PROVIDER", None)
 
 
@@ -123,6 +115,11 @@ class TestOllamaModels:
         assert "mistral:latest" in names
         assert "llama3:latest" in names
 
+    def test_unchanged_list_returns_304(self, ollama_client):
+        etag = ollama_client.get("/api/ollama/models").headers["etag"]
+        resp = ollama_client.get("/api/ollama/models", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+
 
 class TestOllamaStatus:
     def test_status_running(self, ollama_client):
@@ -149,3 +146,126 @@ class TestOllamaEndpointsRequireOllamaProvider:
         resp = client.get("/api/ollama/models")
         # The default mock LLM is not OllamaClient, so endpoint returns 500
         assert resp.status_code in (400, 500)
+
+
+class TestOllamaStream:
+    def _client(self, handler, use_chat_api=True):
+        import httpx
+
+        client = OllamaClient.__new__(OllamaClient)
+        client.base_url = "http://ollama.test"
+        client.model = "m"
+        client.temperature, client.top_p, client.max_tokens = 0.2, 0.9, 64
+        client.use_chat_api = use_chat_api
+        client._client = httpx.Client(transport=httpx.MockTransport(handler))
+        return client
+
+    def test_chat_stream_yields_tokens_until_done(self):
+        import httpx
+
+        def handler(request):
+            assert request.url.path == "/api/chat"
+            body = (
+                b'{"message":{"content":"Hel"},"done":false}\n'
+                b'{"message":{"content":"lo"},"done":false}\n'
+                b'{"message":{"content":""},"done":true}\n'
+                b'{"message":{"content":"ignored"},"done":false}\n'
+            )
+            return httpx.Response(200, content=body)
+
+        assert list(self._client(handler).generate_stream("hi")) == ["Hel", "lo"]
+
+    def test_generate_stream_uses_raw_endpoint(self):
+        import httpx
+
+        def handler(request):
+            assert request.url.path == "/api/generate"
+            return httpx.Response(200, content=b'{"response":"ok","done":true}\n')
+
+        assert list(self._client(handler, use_chat_api=False).generate_stream("hi")) == ["ok"]
+
+    def test_agenerate_many_runs_concurrently(self):
+        import asyncio
+
+        import httpx
+        import orjson
+
+        def handler(request):
+            prompt = orjson.loads(request.content)["messages"][-1]["content"]
+            return httpx.Response(200, json={"message": {"content": f" re:{prompt} "}})
+
+        client = self._client(lambda r: httpx.Response(500))
+        client._aclient = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        assert asyncio.run(client.agenerate_many(["a", "b"])) == ["re:a", "re:b"]
+
+    def test_stream_lines_split_across_network_chunks(self):
+        import httpx
+
+        body = (
+            '{"message":{"content":"ça "},"done":false}\n'
+            '{"message":{"content":"va"},"done":false}\n'
+            '{"message":{"content":"!"},"done":false}'
+        ).encode("utf-8")
+
+        def handler(request):
+            # deliver the body in 5-byte pieces, splitting lines and characters
+            pieces = [body[i:i + 5] for i in range(0, len(body), 5)]
+            return httpx.Response(200, content=iter(pieces))
+
+        assert list(self._client(handler).generate_stream("hi")) == ["ça ", "va", "!"]
+
+
+class TestOllamaModelValidation:
+    def test_construction_is_lazy_and_model_list_cached(self):
+        import httpx
+
+        from app.services.llm import ollama_client
+
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            return httpx.Response(200, json={"models": [{"name": "llama3:latest"}]})
+
+        ollama_client._models_cache.pop("http://tags.test", None)
+        http = httpx.Client(transport=httpx.MockTransport(handler))
+        first = OllamaClient(base_url="http://tags.test", model="missing", http_client=http)
+        assert calls == []
+        assert first.model == "llama3:latest"
+
+        second = OllamaClient(base_url="http://tags.test", model="llama3:latest", http_client=http)
+        assert second.model == "llama3:latest"
+        assert calls == ["/api/tags"]
+
+        unchecked = OllamaClient(
+            base_url="http://tags.test", model="missing", http_client=http, validate_model=False
+        )
+        assert unchecked.model == "missing"
+
+    def test_agenerate_validates_model_off_the_event_loop(self):
+        import asyncio
+        import threading
+
+        import httpx
+
+        from app.services.llm import ollama_client
+
+        tag_threads = []
+
+        def tags(request):
+            tag_threads.append(threading.current_thread())
+            return httpx.Response(200, json={"models": [{"name": "llama3:latest"}]})
+
+        def chat(request):
+            assert b'"model":"llama3:latest"' in request.content
+            return httpx.Response(200, json={"message": {"content": "ok"}})
+
+        ollama_client._models_cache.pop("http://lazy.test", None)
+        client = OllamaClient(
+            base_url="http://lazy.test",
+            model="missing",
+            http_client=httpx.Client(transport=httpx.MockTransport(tags)),
+            async_http_client=httpx.AsyncClient(transport=httpx.MockTransport(chat)),
+        )
+        assert asyncio.run(client.agenerate("hi")) == "ok"
+        assert tag_threads and tag_threads[0] is not threading.main_thread()
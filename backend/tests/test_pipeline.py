@@ -0,0 +1,139 @@
+"""Tests for the RAG pipeline."""
+
+import pytest
+
+from app.services.rag.pipeline import RAGPipeline
+from tests.helpers import MockEmbedder, MockLLMClient, MockVectorStore
+
+
+@pytest.fixture()
+def pipeline(tmp_path):
+    system = tmp_path / "system.txt"
+    rag = tmp_path / "rag.txt"
+    system.write_text("system v1", encoding="utf-8")
+    rag.write_text("rag v1", encoding="utf-8")
+    return RAGPipeline(
+        embedder=MockEmbedder(),
+        store=MockVectorStore(),
+        llm=MockLLMClient(),
+        system_prompt_path=str(system),
+        rag_prompt_path=str(rag),
+    )
+
+
+class TestPipeline:
+    def test_generate_returns_sources(self, pipeline):
+        answer, sources = pipeline.generate("How do I deploy?")
+        assert answer
+        assert sources == ["deploy.md"]
+
+    def test_generate_batch_matches_single(self, pipeline):
+        results = pipeline.generate_batch(["a?", "b?", "c?"])
+        assert results == [pipeline.generate(q) for q in ["a?", "b?", "c?"]]
+
+    def test_reload_prompts(self, pipeline):
+        assert pipeline.system_prompt == "system v1"
+        with open(pipeline.system_prompt_path, "w", encoding="utf-8") as f:
+            f.write("system v2")
+        assert pipeline.system_prompt == "system v1"
+        pipeline.reload_prompts()
+        assert pipeline.system_prompt == "system v2"
+
+    def test_async_stream_matches_sync_stream(self, pipeline):
+        import asyncio
+
+        async def collect():
+            return [event async for event in pipeline.agenerate_stream("How do I deploy?")]
+
+        assert asyncio.run(collect()) == list(pipeline.generate_stream("How do I deploy?"))
+
+    def test_concurrent_async_streams_share_one_search(self, pipeline):
+        import asyncio
+
+        calls = []
+        search_batch = pipeline.store.search_batch
+        pipeline.store.search_batch = lambda qs, **kw: calls.append(len(qs)) or search_batch(qs, **kw)
+
+        async def collect(query):
+            return [event async for event in pipeline.agenerate_stream(query)]
+
+        async def run_all():
+            return await asyncio.gather(*(collect(f"q{i}?") for i in range(5)))
+
+        results = asyncio.run(run_all())
+        assert calls == [5]
+        assert all(r == list(pipeline.generate_stream("q?")) for r in results)
+
+    def test_batched_search_errors_reach_every_caller(self, pipeline):
+        import asyncio
+
+        def fail(*_a, **_kw):
+            raise RuntimeError("index unavailable")
+
+        pipeline.store.search_batch = fail
+
+        async def run_all():
+            return await asyncio.gather(
+                *(pipeline._aretrieve(q) for q in ["a", "b"]), return_exceptions=True
+            )
+
+        assert [str(e) for e in asyncio.run(run_all())] == ["index unavailable"] * 2
+
+    def test_concurrent_async_generate_shares_retrieval(self, pipeline):
+        import asyncio
+
+        calls = []
+        search_batch = pipeline.store.search_batch
+        pipeline.store.search_batch = lambda qs, **kw: calls.append(len(qs)) or search_batch(qs, **kw)
+
+        async def run_all():
+            return await asyncio.gather(*(pipeline.agenerate(q) for q in ["a?", "b?", "c?"]))
+
+        assert asyncio.run(run_all()) == [pipeline.generate(q) for q in ["a?", "b?", "c?"]]
+        assert calls[0] == 3
+
+    def test_user_prompt_layout_follows_reloaded_prompt(self, pipeline):
+        assert pipeline._build_user_prompt("q?", ["a", "b"]) == (
+            "rag v1\nContext:\na\n---\nb\n\nUser question: q?\n"
+            "Answer concisely using only the context."
+        )
+        with open(pipeline.rag_prompt_path, "w", encoding="utf-8") as f:
+            f.write("rag v2")
+        pipeline.reload_prompts()
+        assert pipeline._build_user_prompt("q?", ["a"]).startswith("rag v2\nContext:\na\n")
+
+    def test_contexts_are_clipped_for_the_prompt(self, pipeline):
+        pipeline.max_context_chars = 20
+        prompt = pipeline._build_user_prompt("q?", ["First sentence. Second sentence here.", "short"])
+        assert "Context:\nFirst sentence.\n---\nshort\n" in prompt
+
+        pipeline.max_context_chars = 0
+        assert "Second sentence here." in pipeline._build_user_prompt("q?", ["First sentence. Second sentence here."])
+
+    def test_repeated_query_reuses_retrieval_until_store_changes(self, pipeline):
+        calls = []
+        search = pipeline.store.search
+        pipeline.store.search = lambda *a, **kw: calls.append(1) or search(*a, **kw)
+
+        first = pipeline._retrieve("How do I deploy?")
+        assert pipeline._retrieve("  how do I   DEPLOY? ") is first
+        assert len(calls) == 1
+
+        pipeline.store.generation = 1  # new chunks were added
+        pipeline._retrieve("How do I deploy?")
+        assert len(calls) == 2
+
+    def test_batched_retrieval_only_searches_misses(self, pipeline):
+        pipeline._retrieve("a?")
+        calls = []
+        search_batch = pipeline.store.search_batch
+        pipeline.store.search_batch = lambda qs, **kw: calls.append(len(qs)) or search_batch(qs, **kw)
+
+        assert len(pipeline._retrieve_many(["a?", "b?", "c?"])) == 3
+        assert calls == [2]
+
+    def test_sources_keep_ranking_order(self):
+        from app.services.rag.pipeline import _sources
+
+        hits = [("", 0.9, {"document_name": n}) for n in ["z.md", "a.md", "z.md", "m.md"]]
+        assert _sources(hits) == ["z.md", "a.md", "m.md"]
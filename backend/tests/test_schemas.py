@@ -58,3 +58,44 @@ class TestConfigEndpoint:
         assert "model_name" in body
         assert "vector_store" in body
         assert "embedding_model" in body
+
+    def test_config_revalidates_with_etag(self, client):
+        first = client.get("/api/config")
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "no-cache"
+        resp = client.get("/api/config", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+
+    def test_cached_settings_view_refreshes_on_update(self, client):
+        assert client.get("/api/settings/api-keys").status_code == 200
+        resp = client.put("/api/settings/api-keys", json={"cloud_model": "model-b"})
+        assert resp.json()["cloud_model"] == "model-b"
+        assert client.get("/api/settings/api-keys").json()["cloud_model"] == "model-b"
+
+
+class TestSchemaBuild:
+    def test_all_schemas_built_at_import(self):
+        """Every schema's validator is compiled at import, not on first request."""
+        from pydantic import BaseModel
+
+        import app.models.schemas as schemas
+
+        models = [
+            obj
+            for obj in vars(schemas).values()
+            if isinstance(obj, type) and issubclass(obj, BaseModel) and obj is not BaseModel
+        ]
+        assert models
+        assert [m.__name__ for m in models if not m.__pydantic_complete__] == []
+
+
+class TestFrozenEntries:
+    def test_history_message_is_immutable(self):
+        from pydantic import ValidationError
+
+        from app.models.schemas import HistoryMessage
+
+        msg = HistoryMessage(role="user", text="hi")
+        with pytest.raises(ValidationError):
+            msg.text = "changed"
@@ -0,0 +1,199 @@
+"""Tests for the FAISS vector store."""
+
+import pytest
+
+pytest.importorskip("faiss")
+
+from app.services.rag.vector_store import FaissVectorStore
+
+
+@pytest.fixture()
+def store(tmp_path):
+    s = FaissVectorStore(
+        dim=3,
+        index_path=str(tmp_path / "index.faiss"),
+        metadata_path=str(tmp_path / "meta.json"),
+    )
+    s.add_texts(
+        ["alpha", "beta"],
+        [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]],
+        [{"text": "alpha", "document_name": "a.md"}, {"text": "beta", "document_name": "b.md"}],
+    )
+    return s
+
+
+class TestFaissVectorStore:
+    def test_search(self, store):
+        hits = store.search([1.0, 0.0, 0.0], top_k=2, score_threshold=0.5)
+        assert [h[0] for h in hits] == ["alpha"]
+
+    def test_search_batch_matches_single(self, store):
+        queries = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]
+        batch = store.search_batch(queries, top_k=2, score_threshold=0.5)
+        assert batch == [store.search(q, top_k=2, score_threshold=0.5) for q in queries]
+        assert [hits[0][0] for hits in batch] == ["alpha", "beta"]
+
+    def test_empty_index(self, tmp_path):
+        s = FaissVectorStore(3, str(tmp_path / "i.faiss"), str(tmp_path / "m.json"))
+        assert s.search_batch([[1.0, 0.0, 0.0]], top_k=1, score_threshold=0.0) == [[]]
+
+    def test_reloaded_metadata_shares_repeated_strings(self, tmp_path):
+        from app.services.rag.vector_store import FaissVectorStore
+
+        index_path, meta_path = str(tmp_path / "i.faiss"), str(tmp_path / "m.json")
+        store = FaissVectorStore(4, index_path, meta_path)
+        metas = [
+            {"id": str(i), "document_name": "guide.md", "version": "v1", "tags": ["a", "b"]}
+            for i in range(3)
+        ]
+        store.add_texts(["x", "y", "z"], [[1.0, 0, 0, 0]] * 3, metas)
+        store.save()
+
+        reloaded = list(FaissVectorStore(4, index_path, meta_path)._metadata.rows())
+        assert reloaded[0]["document_name"] is reloaded[2]["document_name"]
+        assert reloaded[0]["tags"] is reloaded[1]["tags"] == ["a", "b"]
+        assert reloaded[1] == metas[1]
+
+    def test_accepts_float32_arrays(self, tmp_path):
+        import numpy as np
+
+        from app.services.rag.vector_store import FaissVectorStore
+
+        store = FaissVectorStore(4, str(tmp_path / "i.faiss"), str(tmp_path / "m.json"))
+        vectors = np.eye(4, dtype=np.float32)[:2]
+        store.add_texts(["a", "b"], vectors, [{"text": "a"}, {"text": "b"}])
+        store.add_texts([], np.empty((0, 4), dtype=np.float32), [])
+
+        [hit] = store.search(vectors[1], top_k=1, score_threshold=0.5)
+        assert hit[0] == "b"
+
+    def test_hnsw_index_search_and_reload(self, tmp_path):
+        import numpy as np
+
+        index_path, meta_path = str(tmp_path / "i.faiss"), str(tmp_path / "m.json")
+        store = FaissVectorStore(8, index_path, meta_path, index_type="hnsw")
+        vectors = np.eye(8, dtype=np.float32)
+        store.add_texts([str(i) for i in range(8)], vectors, [{"text": str(i)} for i in range(8)])
+        assert [h[0] for h in store.search(vectors[5], top_k=1, score_threshold=0.5)] == ["5"]
+        store.save()
+
+        reloaded = FaissVectorStore(8, index_path, meta_path)
+        assert reloaded.index.hnsw.efSearch == 64
+        assert [h[0] for h in reloaded.search(vectors[2], top_k=1, score_threshold=0.5)] == ["2"]
+
+    def test_unknown_index_type(self, tmp_path):
+        with pytest.raises(ValueError):
+            FaissVectorStore(3, str(tmp_path / "i.faiss"), str(tmp_path / "m.json"), index_type="ivf")
+
+    def test_sq8_index_round_trip(self, tmp_path):
+        import numpy as np
+
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((64, 16)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+        index_path, meta_path = str(tmp_path / "i.faiss"), str(tmp_path / "m.json")
+        store = FaissVectorStore(16, index_path, meta_path, index_type="sq8")
+        store.add_texts([str(i) for i in range(64)], vectors, [{"text": str(i)} for i in range(64)])
+        [(text, score, _)] = store.search(vectors[7], top_k=1, score_threshold=0.5)
+        assert text == "7" and score == pytest.approx(1.0, abs=0.02)
+
+        store.save()
+        reloaded = FaissVectorStore(16, index_path, meta_path)
+        assert reloaded.search(vectors[9], top_k=1, score_threshold=0.5)[0][0] == "9"
+
+    def test_sq8_index_accurate_after_tiny_first_batch(self, tmp_path):
+        import numpy as np
+
+        rng = np.random.default_rng(1)
+        vectors = rng.standard_normal((33, 384)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+        store = FaissVectorStore(
+            384, str(tmp_path / "i.faiss"), str(tmp_path / "m.json"), index_type="sq8"
+        )
+        store.add_texts(["0"], vectors[:1], [{"text": "0"}])
+        store.add_texts(
+            [str(i) for i in range(1, 33)], vectors[1:], [{"text": str(i)} for i in range(1, 33)]
+        )
+        for i in (0, 5, 32):
+            [(text, score, _)] = store.search(vectors[i], top_k=1, score_threshold=0.5)
+            assert text == str(i) and score == pytest.approx(1.0, abs=0.02)
+
+    def test_save_appends_only_new_metadata(self, tmp_path):
+        index_path, meta_path = str(tmp_path / "i.faiss"), tmp_path / "m.jsonl"
+        store = FaissVectorStore(3, index_path, str(meta_path))
+        store.add_texts(["a"], [[1.0, 0.0, 0.0]], [{"text": "a"}])
+        store.save()
+        before = meta_path.read_bytes()
+
+        store = FaissVectorStore(3, index_path, str(meta_path))
+        store.add_texts(["b"], [[0.0, 1.0, 0.0]], [{"text": "b"}])
+        store.save()
+        assert meta_path.read_bytes() == before + b'{"text":"b"}\n'
+        assert FaissVectorStore(3, index_path, str(meta_path))._metadata.texts == ["a", "b"]
+
+    def test_legacy_json_metadata_is_migrated(self, tmp_path):
+        import json
+
+        import faiss
+        import numpy as np
+
+        index = faiss.IndexFlatIP(3)
+        index.add(np.eye(3, dtype=np.float32)[:1])
+        faiss.write_index(index, str(tmp_path / "i.faiss"))
+        legacy = tmp_path / "m.json"
+        legacy.write_text(json.dumps([{"text": "old"}], indent=2))
+
+        store = FaissVectorStore(3, str(tmp_path / "i.faiss"), str(tmp_path / "m.jsonl"))
+        assert store.search([1.0, 0.0, 0.0], top_k=1, score_threshold=0.5)[0][0] == "old"
+        store.save()
+        assert not legacy.exists()
+        assert (tmp_path / "m.jsonl").read_bytes() == b'{"text":"old"}\n'
+
+    def test_metadata_ahead_of_index_is_dropped(self, tmp_path):
+        index_path, meta_path = str(tmp_path / "i.faiss"), tmp_path / "m.jsonl"
+        store = FaissVectorStore(3, index_path, str(meta_path))
+        store.add_texts(["a"], [[1.0, 0.0, 0.0]], [{"text": "a"}])
+        store.save()
+        with open(meta_path, "ab") as fh:  # crash between metadata append and index write
+            fh.write(b'{"text":"lost"}\n{"text":"to')
+
+        store = FaissVectorStore(3, index_path, str(meta_path))
+        assert store._metadata.texts == ["a"]
+        store.add_texts(["b"], [[0.0, 1.0, 0.0]], [{"text": "b"}])
+        store.save()
+        assert meta_path.read_bytes() == b'{"text":"a"}\n{"text":"b"}\n'
+
+    def test_count_metadata_file_matches_load(self, tmp_path):
+        from app.services.rag.vector_store import count_metadata_file, load_metadata_file
+
+        jsonl = tmp_path / "m.jsonl"
+        jsonl.write_bytes(b'{"text":"a"}\n{"text":"b"}\n{"text":"to')
+        legacy = tmp_path / "m.json"
+        legacy.write_text('[{"text": "a"}, {"text": "b"}]')
+        for path in (jsonl, legacy):
+            assert count_metadata_file(path) == len(load_metadata_file(path)) == 2
+
+    def test_metadata_rows_round_trip_extra_fields(self, tmp_path):
+        index_path, meta_path = str(tmp_path / "i.faiss"), str(tmp_path / "m.jsonl")
+        store = FaissVectorStore(3, index_path, meta_path)
+        metas = [{"document_name": "a.md", "page": 3}, {"text": "b", "chunk_id": "c1"}]
+        store.add_texts(["a", "b"], [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]], metas)
+
+        [(text, _, meta)] = store.search([1.0, 0.0, 0.0], top_k=1, score_threshold=0.5)
+        assert (text, meta) == ("", metas[0])
+        store.save()
+        assert list(FaissVectorStore(3, index_path, meta_path)._metadata.rows()) == metas
+
+    def test_faiss_threads_default_to_all_cores(self):
+        import os
+
+        import faiss
+
+        from app.services.rag.vector_store import set_faiss_threads
+
+        set_faiss_threads(1)
+        assert faiss.omp_get_max_threads() == 1
+        set_faiss_threads()
+        assert faiss.omp_get_max_threads() == (os.cpu_count() or 1)